@@ -11,7 +11,6 @@ picked up by script 11, which uses neighbour interpolation.
 """
 
 import os
-import uuid
 import logging
 import argparse
 from typing import Optional, List, Dict, Set, Tuple, Any
@@ -21,7 +20,7 @@ from sqlalchemy import create_engine, text, insert
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import SQLAlchemyError
 
-from models import Base, Page2Document, LinkConfidence
+from models import Base, Page2Document, LinkConfidence, new_uuid
 
 # ---------------------------------------------------------------------------
 # Configuration
@@ -158,7 +157,7 @@ def match_folios(database_url: str) -> Dict[str, int]:
                                 continue
 
                             inv_new_rows.append({
-                                "id": str(uuid.uuid4()),
+                                "id": new_uuid(),
                                 "page_id": page_id,
                                 "document_id": doc_id,
                                 "index": folio_num,
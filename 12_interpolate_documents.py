@@ -26,7 +26,6 @@ from __future__ import annotations
 import argparse
 import logging
 import os
-import uuid
 from typing import Optional
 
 from sqlalchemy import create_engine, text
@@ -38,6 +37,7 @@ from models import (
     Page,
     Page2Document,
     LinkConfidence,
+    new_uuid,
 )
 
 log = logging.getLogger(__name__)
@@ -249,7 +249,7 @@ def _link_scan_to_document(
 
         if not dry_run:
             p2d = Page2Document(
-                id=str(uuid.uuid4()),
+                id=new_uuid(),
                 page_id=page.id,
                 document_id=document_id,
                 index=next_index,
@@ -47,7 +47,6 @@ Run with --dry-run first to preview what would be linked.
 """
 
 import os
-import uuid
 import logging
 import argparse
 from collections import Counter, defaultdict
@@ -57,7 +56,7 @@ from sqlalchemy import create_engine, text
 from sqlalchemy.orm import Session, sessionmaker
 from sqlalchemy.exc import SQLAlchemyError
 
-from models import Base, LinkConfidence
+from models import Base, LinkConfidence, new_uuid
 
 DATABASE_URL = os.environ.get("DATABASE_URL", "sqlite:///globalise_documents.db")
 BASELINE_METHOD_NAME = "Baseline: Empty Pages & Signatures"
@@ -247,7 +246,7 @@ def _process_inventory(
         for page_id, folio_num in zip(left_gap, before_missing):
             new_rows.append(
                 {
-                    "id": str(uuid.uuid4()),
+                    "id": new_uuid(),
                     "page_id": page_id,
                     "document_id": doc_id,
                     "index": folio_num,
@@ -261,7 +260,7 @@ def _process_inventory(
         for page_id, folio_num in zip(right_gap, after_missing):
             new_rows.append(
                 {
-                    "id": str(uuid.uuid4()),
+                    "id": new_uuid(),
                     "page_id": page_id,
                     "document_id": doc_id,
                     "index": folio_num,
@@ -55,7 +55,6 @@ import glob
 import logging
 import os
 import re
-import uuid
 from collections import defaultdict
 from typing import Optional
 
@@ -76,6 +75,7 @@ from models import (
     Page,
     Page2Document,
     Scan,
+    new_uuid,
 )
 
 logging.basicConfig(
@@ -222,7 +222,7 @@ def get_or_create_method(
     if existing:
         return existing
     method = DocumentIdentificationMethod(
-        id=str(uuid.uuid4()),
+        id=new_uuid(),
         name=name,
         description=description,
     )
@@ -274,7 +274,7 @@ def create_or_get_external_id(
     )
     ext = session.scalars(stmt).first()
     if not ext:
-        ext = ExternalID(id=str(uuid.uuid4()), identifier=identifier, context=context)
+        ext = ExternalID(id=new_uuid(), identifier=identifier, context=context)
         session.add(ext)
         session.flush()
     return ext
@@ -385,7 +385,7 @@ class PageLinker:
             idx = self._next_index[document.id]
             self.session.add(
                 Page2Document(
-                    id=str(uuid.uuid4()),
+                    id=new_uuid(),
                     page_id=page.id,
                     document_id=document.id,
                     index=idx,
@@ -488,7 +488,7 @@ def import_file(
                     )
                 else:
                     doc = Document(
-                        id=str(uuid.uuid4()),
+                        id=new_uuid(),
                         inventory_id=inventory.id,
                         method_id=tanap_method.id,
                     )
@@ -496,7 +496,7 @@ def import_file(
                     session.flush()
                     session.add(
                         Document2ExternalID(
-                            id=str(uuid.uuid4()),
+                            id=new_uuid(),
                             document_id=doc.id,
                             external_id=ext.id,
                         )
@@ -542,7 +542,7 @@ def import_file(
                         )
                     else:
                         current_subdoc = Document(
-                            id=str(uuid.uuid4()),
+                            id=new_uuid(),
                             inventory_id=inventory.id,
                             method_id=subdoc_method.id,
                             part_of_id=current_tanap_doc.id if current_tanap_doc else None,
@@ -551,7 +551,7 @@ def import_file(
                         session.flush()
                         session.add(
                             Document2ExternalID(
-                                id=str(uuid.uuid4()),
+                                id=new_uuid(),
                                 document_id=current_subdoc.id,
                                 external_id=ext.id,
                             )
@@ -0,0 +1,72 @@
+"""
+Bring the indexes of an existing database in line with models.py.
+
+The page2document, scan and page tables now carry composite indexes:
+
+  - page2document (document_id, index)  → a document's pages in page order
+  - scan          (inventory_id, filename)
+  - page          (inventory_id, scan_id)
+
+Each replaces the single-column index on its leading column, which the
+composite index already covers. Base.metadata.create_all() does not touch
+tables that already exist, so this script creates the composite indexes and
+drops the old ones. It is safe to rerun.
+"""
+
+import argparse
+import logging
+import os
+
+from sqlalchemy import create_engine, inspect, text
+
+from models import Base, Page, Page2Document, Scan
+
+logging.basicConfig(
+    level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s"
+)
+logger = logging.getLogger(__name__)
+
+DATABASE_URL = os.environ.get("DATABASE_URL", "sqlite:///globalise_documents.db")
+
+# Single-column indexes made redundant by a composite index
+REDUNDANT_INDEXES = {
+    "page2document": "ix_page2document_document_id",
+    "scan": "ix_scan_inventory_id",
+    "page": "ix_page_inventory_id",
+}
+
+
+def ensure_composite_indexes(engine):
+    """Create the composite indexes and drop the single-column ones they cover."""
+    for model in (Page2Document, Scan, Page):
+        for index in model.__table__.indexes:
+            if len(index.columns) > 1:
+                index.create(engine, checkfirst=True)
+                logger.info("Ensured index %s", index.name)
+
+    inspector = inspect(engine)
+    for table, index_name in REDUNDANT_INDEXES.items():
+        existing = {ix["name"] for ix in inspector.get_indexes(table)}
+        if index_name in existing:
+            with engine.begin() as conn:
+                conn.execute(text(f"DROP INDEX {index_name}"))
+            logger.info("Dropped redundant index %s", index_name)
+
+
+def main(db_url: str):
+    engine = create_engine(db_url, echo=False)
+    Base.metadata.create_all(engine)
+    ensure_composite_indexes(engine)
+
+    if engine.dialect.name == "sqlite":
+        with engine.begin() as conn:
+            conn.execute(text("ANALYZE"))
+        logger.info("Refreshed query planner statistics")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--db", default=DATABASE_URL, help="Database URL")
+    args = parser.parse_args()
+
+    main(args.db)
@@ -0,0 +1,111 @@
+"""
+Add and backfill document.page_count on an existing database.
+
+Document.number_of_pages reads the stored page_count column instead of
+counting page2document rows on every access. The column is kept up to date
+by triggers on page2document (see PAGE_COUNT_TRIGGERS in models.py), which
+Base.metadata.create_all() only installs when it creates that table. This
+script adds the column and the triggers to a database created before them,
+then recounts every document's page links. It is safe to rerun.
+"""
+
+import argparse
+import logging
+import os
+import time
+
+from sqlalchemy import create_engine, inspect, text
+
+from models import PAGE_COUNT_TRIGGERS, Base
+
+logging.basicConfig(
+    level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s"
+)
+logger = logging.getLogger(__name__)
+
+DATABASE_URL = os.environ.get("DATABASE_URL", "sqlite:///globalise_documents.db")
+
+
+def ensure_page_count_column(engine, dry_run: bool = False) -> bool:
+    """Add the `page_count` column to the `document` table if it is missing.
+
+    Returns whether the column exists afterwards.
+    """
+    inspector = inspect(engine)
+    columns = {col["name"] for col in inspector.get_columns("document")}
+    if "page_count" not in columns:
+        if dry_run:
+            logger.info("Dry run — would add 'page_count' column to document table")
+            return False
+        with engine.begin() as conn:
+            conn.execute(
+                text(
+                    "ALTER TABLE document ADD COLUMN page_count INTEGER NOT NULL DEFAULT 0"
+                )
+            )
+        logger.info("Added 'page_count' column to document table")
+    return True
+
+
+def ensure_page_count_triggers(engine, dry_run: bool = False):
+    """Install the page2document triggers that maintain page_count."""
+    statements = PAGE_COUNT_TRIGGERS.get(engine.dialect.name)
+    if statements is None:
+        logger.warning(
+            "No page_count triggers defined for %s; page_count will not be "
+            "maintained on later writes",
+            engine.dialect.name,
+        )
+        return
+    if dry_run:
+        logger.info("Dry run — would install page_count triggers")
+        return
+    with engine.begin() as conn:
+        for statement in statements:
+            conn.execute(text(statement))
+    logger.info("Installed page_count triggers")
+
+
+def backfill_page_count(engine, dry_run: bool = False):
+    """Set every document's page_count to its number of page links."""
+    t0 = time.time()
+    with engine.connect() as conn:
+        result = conn.execute(
+            text(
+                "UPDATE document SET page_count = ("
+                "SELECT COUNT(*) FROM page2document "
+                "WHERE page2document.document_id = document.id)"
+            )
+        )
+        logger.info(
+            "Recounted pages for %d documents (%.1fs)",
+            result.rowcount,
+            time.time() - t0,
+        )
+        if dry_run:
+            logger.info("Dry run — rolling back")
+            conn.rollback()
+        else:
+            conn.commit()
+            logger.info("Committed")
+
+
+def main(db_url: str, dry_run: bool = False):
+    engine = create_engine(db_url, echo=False)
+    # A dry run changes nothing: no tables, column or triggers are created,
+    # and the recount is only run (and rolled back) if the column exists
+    if not dry_run:
+        Base.metadata.create_all(engine)
+    has_column = ensure_page_count_column(engine, dry_run=dry_run)
+    ensure_page_count_triggers(engine, dry_run=dry_run)
+    if has_column:
+        backfill_page_count(engine, dry_run=dry_run)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--db", default=DATABASE_URL, help="Database URL")
+    parser.add_argument("--dry-run", action="store_true", help="Do not commit changes")
+    args = parser.parse_args()
+
+    main(args.db, dry_run=args.dry_run)
@@ -13,7 +13,7 @@ from datetime import datetime
 from sqlalchemy import create_engine, text
 from sqlalchemy.orm import Session
 
-from models import Base, Inventory, InventoryTitle, Scan
+from models import Base, Inventory, InventoryTitle, Scan, new_uuid
 
 # Configure logging
 logging.basicConfig(
@@ -262,7 +262,7 @@ def main():
         inventory_rows = []
         title_rows = []
         for inventory_number, inv_data in inventory_data.items():
-            inv_id = str(uuid.uuid4())
+            inv_id = new_uuid()
             processed_inventories[inventory_number] = inv_id
             inventory_rows.append(
                 {
@@ -279,7 +279,7 @@ def main():
             for title in inv_data["titles"]:
                 title_rows.append(
                     {
-                        "id": str(uuid.uuid4()),
+                        "id": new_uuid(),
                         "title": title,
                         "inventory_id": inv_id,
                     }
@@ -315,7 +315,7 @@ def main():
             seen.add(filename)
             batch.append(
                 {
-                    "id": str(uuid.uuid4()),
+                    "id": new_uuid(),
                     "filename": filename,
                     "na_identifier": scan_item["na_identifier"],
                     "iiif_image_info": scan_item["iiif_info_url"],
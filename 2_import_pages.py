@@ -7,12 +7,11 @@ import os
 import sys
 import ast
 import logging
-import uuid
 import pandas as pd
 from sqlalchemy import create_engine, text
 from sqlalchemy.orm import Session
 
-from models import Base, Page, PageType, RectoVerso
+from models import Base, Page, PageType, RectoVerso, new_uuid
 
 # Configure logging
 logging.basicConfig(
@@ -192,7 +191,7 @@ def main():
                 # Verso
                 page_rows.append(
                     {
-                        "id": str(uuid.uuid4()),
+                        "id": new_uuid(),
                         "page_or_folio_number": page_numbers,
                         "recto_verso": RectoVerso.VERSO.value,
                         "header": headers,
@@ -211,7 +210,7 @@ def main():
                 # Recto
                 page_rows.append(
                     {
-                        "id": str(uuid.uuid4()),
+                        "id": new_uuid(),
                         "page_or_folio_number": page_numbers,
                         "recto_verso": RectoVerso.RECTO.value,
                         "header": headers,
@@ -230,7 +229,7 @@ def main():
             else:
                 page_rows.append(
                     {
-                        "id": str(uuid.uuid4()),
+                        "id": new_uuid(),
                         "page_or_folio_number": page_numbers,
                         "recto_verso": None,
                         "header": headers,
@@ -14,7 +14,6 @@ A new document starts:
 This creates a baseline document identification method and assigns pages to documents.
 """
 
-import uuid
 from datetime import datetime
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker, Session
@@ -25,6 +24,7 @@ from models import (
     Document,
     DocumentIdentificationMethod,
     Page2Document,
+    new_uuid,
 )
 import os
 from typing import Optional
@@ -57,7 +57,7 @@ def create_identification_method(session: Session) -> str:
 
     # Create new method
     method = DocumentIdentificationMethod(
-        id=str(uuid.uuid4()),
+        id=new_uuid(),
         name="Baseline: Empty Pages & Signatures",
         description=(
             "Identifies documents in early modern archival inventories:\n"
@@ -159,7 +159,7 @@ def identify_documents_for_inventory(
         # Create new document and add page (only for non-blank pages)
         if start_new_document and not page.is_blank:
             current_document = Document(
-                id=str(uuid.uuid4()),
+                id=new_uuid(),
                 inventory_id=inventory.id,
                 method_id=method_id,
             )
@@ -169,7 +169,7 @@ def identify_documents_for_inventory(
             page_index = 0
 
             page2doc = Page2Document(
-                id=str(uuid.uuid4()),
+                id=new_uuid(),
                 page_id=page.id,
                 document_id=current_document.id,
                 index=page_index,
@@ -184,7 +184,7 @@ def identify_documents_for_inventory(
         elif current_document and not page.is_blank:
             # Add non-blank page to existing document
             page2doc = Page2Document(
-                id=str(uuid.uuid4()),
+                id=new_uuid(),
                 page_id=page.id,
                 document_id=current_document.id,
                 index=page_index,
@@ -25,7 +25,6 @@ Upsert behaviour
 
 import os
 import sys
-import uuid
 import logging
 from pathlib import Path
 
@@ -33,7 +32,7 @@ import pandas as pd
 from sqlalchemy import create_engine, text
 from sqlalchemy.orm import Session
 
-from models import Base, Settlement, SettlementLabel
+from models import Base, Settlement, SettlementLabel, new_uuid
 
 logging.basicConfig(
     level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s"
@@ -122,7 +121,7 @@ def import_settlements(csv_path: Path, database_url: str) -> dict:
             if glob_id in existing_settlements:
                 stats["skipped_settlements"] += 1
                 continue
-            new_id = str(uuid.uuid4())
+            new_id = new_uuid()
             settlement_rows.append({"id": new_id, "glob_id": glob_id})
             existing_settlements[glob_id] = new_id   # make visible for label pass
             stats["settlements_created"] += 1
@@ -150,7 +149,7 @@ def import_settlements(csv_path: Path, database_url: str) -> dict:
 
             label_rows.append(
                 {
-                    "id": str(uuid.uuid4()),
+                    "id": new_uuid(),
                     "label": label,
                     "settlement_id": settlement_id,
                 }
@@ -60,6 +60,7 @@ from models import (
     Document2ExternalID,
     DocumentIdentificationMethod,
     ExternalID,
+    new_uuid,
 )
 
 logging.basicConfig(
@@ -179,7 +180,7 @@ def get_or_create_method(session: Session) -> str:
         return existing.id
 
     method = DocumentIdentificationMethod(
-        id=str(uuid.uuid4()),
+        id=new_uuid(),
         name=METHOD_NAME,
         description=(
             "Documents identified from the GLOBALISE Digitized Indexes of the "
@@ -354,7 +355,7 @@ def main():
                 else:
                     unmatched_settlements.add(settlement_label)
 
-            doc_id = str(uuid.uuid4())
+            doc_id = new_uuid()
 
             doc_rows.append(
                 {
@@ -386,7 +387,7 @@ def main():
             for type_uuid in type_uuids_for_doc:
                 doc_type_rows.append(
                     {
-                        "id": str(uuid.uuid4()),
+                        "id": new_uuid(),
                         "document_id": doc_id,
                         "document_type_id": type_uuid,
                     }
@@ -401,7 +402,7 @@ def main():
                 identifier = int_or_none(raw_value)
                 if identifier is None:
                     continue
-                ext_id = str(uuid.uuid4())
+                ext_id = new_uuid()
                 ext_id_rows.append(
                     {
                         "id": ext_id,
@@ -412,7 +413,7 @@ def main():
                 )
                 doc_ext_id_rows.append(
                     {
-                        "id": str(uuid.uuid4()),
+                        "id": new_uuid(),
                         "document_id": doc_id,
                         "external_id": ext_id,
                     }
@@ -18,7 +18,6 @@ Each CSV row maps to one Document, with:
 
 import argparse
 import logging
-import uuid
 import os
 from datetime import date, datetime
 from typing import Optional, Tuple
@@ -40,6 +39,7 @@ from models import (
     Page,
     Page2Document,
     Scan,
+    new_uuid,
 )
 
 logging.basicConfig(
@@ -107,7 +107,7 @@ def get_or_create_method(session: Session) -> DocumentIdentificationMethod:
         return existing
 
     method = DocumentIdentificationMethod(
-        id=str(uuid.uuid4()),
+        id=new_uuid(),
         name=METHOD_NAME,
         description=(
             "Document boundaries for General Missives identified by Kay Pepping."
@@ -167,7 +167,7 @@ def create_or_get_external_id(
     ext = session.scalars(stmt).first()
     if not ext:
         ext = ExternalID(
-            id=str(uuid.uuid4()),
+            id=new_uuid(),
             identifier=identifier,
             context=context,
         )
@@ -214,7 +214,7 @@ def import_row(
     title = str(title).strip() if pd.notna(title) else None
 
     document = Document(
-        id=str(uuid.uuid4()),
+        id=new_uuid(),
         inventory_id=inventory.id,
         title=title,
         date_text=date_text,
@@ -232,7 +232,7 @@ def import_row(
         tanap_id = str(int(tanap_id_raw))
         ext_id = create_or_get_external_id(session, tanap_id, "OBP_INDEX")
         link = Document2ExternalID(
-            id=str(uuid.uuid4()),
+            id=new_uuid(),
             document_id=document.id,
             external_id=ext_id.id,
         )
@@ -294,7 +294,7 @@ def import_row(
 
         for page in pages:
             p2d = Page2Document(
-                id=str(uuid.uuid4()),
+                id=new_uuid(),
                 page_id=page.id,
                 document_id=document.id,
                 index=next_index,
@@ -342,7 +342,7 @@ def import_row(
     #             continue  # first == last scan: don't double-link
     #         linked_page_ids.add(page.id)
     #         p2d = Page2Document(
-    #             id=str(uuid.uuid4()),
+    #             id=new_uuid(),
     #             page_id=page.id,
     #             document_id=document.id,
     #             index=next_index,
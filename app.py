@@ -3,8 +3,18 @@ Flask web application for inspecting GLOBALISE documents.
 Provides a web interface to browse inventories, documents, scans, and pages.
 """
 
-from flask import Flask, render_template, request, abort, Response, redirect, url_for
+from flask import (
+    Flask,
+    render_template,
+    request,
+    abort,
+    Response,
+    redirect,
+    url_for,
+    stream_with_context,
+)
 from flask_cors import CORS
+from collections import OrderedDict, defaultdict
 from datetime import datetime
 from sqlalchemy import create_engine, desc, func, event
 from sqlalchemy.orm import sessionmaker, scoped_session
@@ -23,15 +33,27 @@ from models import (
     SettlementLabel,
 )
 from export import (  # type: ignore[import-not-found]
-    inventory_to_manifest_jsonld,
+    inventory_to_manifest_jsonld_stream,
     scan_to_jsonld,
     page_to_jsonld,
     document_physical_to_jsonld,
     inventory_to_jsonld,
     series_to_jsonld,
+    dumps_jsonld,
+)
+from queries import (
+    DOCUMENT_EXTERNAL_IDS,
+    MANIFEST_INVENTORY_OPTIONS,
+    PAGE_BY_ID,
+    SCAN_BY_FILENAME,
+    fetch_document_page_ids,
+    fetch_inventory_tree,
+    load_document_for_api,
+    load_page_for_api,
 )
-import json
+import hashlib
 import os
+import threading
 
 # Initialize Flask app
 app = Flask(__name__)
@@ -42,6 +64,14 @@ app.config["SQLALCHEMY_DATABASE_URI"] = os.environ.get(
     "DATABASE_URL", "sqlite:///globalise_documents.db"
 )
 app.config["BASE_URL"] = os.environ.get("BASE_URL", "")
+# Serialized IIIF manifests kept in memory per worker: at most this many
+# (0 disables the cache) and at most this many bytes in total, since large
+# inventories serialize to several MB each. Only used for a local SQLite
+# file, whose modification time tells when cached manifests are stale.
+app.config["MANIFEST_CACHE_SIZE"] = int(os.environ.get("MANIFEST_CACHE_SIZE", "16"))
+app.config["MANIFEST_CACHE_MAX_BYTES"] = int(
+    os.environ.get("MANIFEST_CACHE_MAX_BYTES", str(64 * 1024 * 1024))
+)
 
 # CORS
 
@@ -82,6 +112,16 @@ def register_inv_sortkey(dbapi_connection, connection_record):
         pass
 
 
+# SQLite only applies ON DELETE CASCADE (which the passive_deletes
+# relationships rely on) when foreign key enforcement is switched on
+@event.listens_for(engine, "connect")
+def enable_sqlite_foreign_keys(dbapi_connection, connection_record):
+    if engine.dialect.name == "sqlite":
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA foreign_keys = ON")
+        cursor.close()
+
+
 Base.metadata.create_all(engine)
 session_factory = sessionmaker(bind=engine)
 Session = scoped_session(session_factory)
@@ -101,6 +141,121 @@ def get_or_404(query):
     return result
 
 
+def jsonld_response(data):
+    """Serialize a JSON-LD / IIIF structure into an application/ld+json response."""
+    return Response(dumps_jsonld(data), mimetype="application/ld+json")
+
+
+# Serialized manifests and their ETags keyed by (inventory id, fingerprint),
+# least recently used first
+manifest_cache: "OrderedDict[tuple, tuple[bytes, str]]" = OrderedDict()
+manifest_cache_bytes = 0
+manifest_cache_lock = threading.Lock()
+
+
+def database_version():
+    """
+    Modification times of the SQLite database file and its WAL.
+
+    Any write to the database, including in-place edits by the import
+    scripts (retitled documents, annotation flags), changes this. Empty for
+    databases that are not a local file, which have no such change marker.
+    """
+    if engine.dialect.name != "sqlite" or engine.url.database in (None, "", ":memory:"):
+        return ()
+    version = []
+    for path in (engine.url.database, engine.url.database + "-wal"):
+        try:
+            version.append(os.stat(path).st_mtime_ns)
+        except OSError:
+            version.append(None)
+    return tuple(version)
+
+
+def manifest_fingerprint(db_session, inventory):
+    """
+    Cheap fingerprint of the rows an inventory's manifest is built from.
+
+    There are no updated_at columns, so this combines the database file's
+    modification time (see database_version) with counts of the inventory's
+    scans, pages, documents and page links. Counts alone miss in-place edits,
+    so manifests are only cached when database_version() is not empty.
+    """
+    counts = db_session.query(
+        db_session.query(func.count(Scan.id))
+        .filter(Scan.inventory_id == inventory.id)
+        .scalar_subquery(),
+        db_session.query(func.count(Page.id))
+        .filter(Page.inventory_id == inventory.id)
+        .scalar_subquery(),
+        db_session.query(func.count(Document.id))
+        .filter(Document.inventory_id == inventory.id)
+        .scalar_subquery(),
+        db_session.query(func.count(Page2Document.id))
+        .join(Document, Page2Document.document_id == Document.id)
+        .filter(Document.inventory_id == inventory.id)
+        .scalar_subquery(),
+    ).one()
+    return database_version() + tuple(counts)
+
+
+def manifest_cache_enabled():
+    return (
+        app.config["MANIFEST_CACHE_SIZE"] > 0
+        and app.config["MANIFEST_CACHE_MAX_BYTES"] > 0
+        and bool(database_version())
+    )
+
+
+def manifest_cache_get(key):
+    """Return (body, etag) for a cached manifest, or None."""
+    with manifest_cache_lock:
+        entry = manifest_cache.get(key)
+        if entry is not None:
+            manifest_cache.move_to_end(key)
+        return entry
+
+
+def manifest_cache_put(key, body):
+    global manifest_cache_bytes
+    max_bytes = app.config["MANIFEST_CACHE_MAX_BYTES"]
+    if not manifest_cache_enabled() or len(body) > max_bytes:
+        return
+    # The ETag is derived from the bytes themselves, so a client revalidating
+    # after a restart only gets a 304 if the content is really unchanged
+    etag = hashlib.blake2b(body, digest_size=16).hexdigest()
+    with manifest_cache_lock:
+        old = manifest_cache.pop(key, None)
+        if old is not None:
+            manifest_cache_bytes -= len(old[0])
+        manifest_cache[key] = (body, etag)
+        manifest_cache_bytes += len(body)
+        while (
+            len(manifest_cache) > app.config["MANIFEST_CACHE_SIZE"]
+            or manifest_cache_bytes > max_bytes
+        ):
+            _, (evicted, _) = manifest_cache.popitem(last=False)
+            manifest_cache_bytes -= len(evicted)
+
+
+class BufferedBytesIter:
+    """Coalesce small byte chunks into writes of at least `size` bytes."""
+
+    def __init__(self, chunks, size=256 * 1024):
+        self.chunks = chunks
+        self.size = size
+
+    def __iter__(self):
+        buf = bytearray()
+        for chunk in self.chunks:
+            buf += chunk
+            if len(buf) >= self.size:
+                yield bytes(buf)
+                buf.clear()
+        if buf:
+            yield bytes(buf)
+
+
 # slugify helper moved to export.py
 
 
@@ -157,41 +312,34 @@ def inventories():
 @app.route("/inventory/<inventory_number>")
 def inventory_detail(inventory_number):
     """Show details of a specific inventory."""
+    from sqlalchemy.orm import lazyload
+
     db_session = Session()
     inventory = get_or_404(
         db_session.query(Inventory).filter_by(inventory_number=inventory_number)
     )
 
-    # Get documents in this inventory with scan information
-    documents = db_session.query(Document).filter_by(inventory_id=inventory.id).all()
+    # Get documents in this inventory with scan information; number_of_pages
+    # falls back to the stored page_count, so skip the page links
+    documents = (
+        db_session.query(Document)
+        .options(lazyload(Document.pages))
+        .filter_by(inventory_id=inventory.id)
+        .all()
+    )
+
+    # First and last scan of each document, from one query over all page
+    # links (rows come ordered by document and page index)
+    scan_range = {}
+    for row in fetch_inventory_tree(db_session, inventory.id):
+        first, _ = scan_range.get(row["document_id"], (row["filename"], None))
+        scan_range[row["document_id"]] = (first, row["filename"])
 
     # Add scan filename information to each document
     for doc in documents:
-        if doc.pages:
-            # Sort pages by index to get first and last
-            sorted_pages = sorted(doc.pages, key=lambda p: p.index)
-            if sorted_pages:
-                first_page = (
-                    db_session.query(Page).filter_by(id=sorted_pages[0].page_id).first()
-                )
-                last_page = (
-                    db_session.query(Page)
-                    .filter_by(id=sorted_pages[-1].page_id)
-                    .first()
-                )
-
-                doc.first_scan_filename = (
-                    first_page.scan.filename if first_page and first_page.scan else None
-                )
-                doc.last_scan_filename = (
-                    last_page.scan.filename if last_page and last_page.scan else None
-                )
-            else:
-                doc.first_scan_filename = None
-                doc.last_scan_filename = None
-        else:
-            doc.first_scan_filename = None
-            doc.last_scan_filename = None
+        doc.first_scan_filename, doc.last_scan_filename = scan_range.get(
+            doc.id, (None, None)
+        )
 
     # Get scans in this inventory
     scans = (
@@ -260,7 +408,7 @@ def inventory_detail(inventory_number):
         return nodes
 
     series_paths = []
-    if getattr(inventory, "member_of_series", None):
+    if inventory.member_of_series:
         for s in inventory.member_of_series:
             series_paths.append(build_series_path(s))
 
@@ -287,26 +435,35 @@ def prepare_timeline_data(db_session, inventory_id):
     - groups: list of identification methods
     - items: list of documents with their page ranges
     """
-    # Get all pages for this inventory, ordered by scan filename and page id
-    pages = (
-        db_session.query(Page)
+    from sqlalchemy.orm import lazyload
+
+    # Get all page ids for this inventory, ordered by scan filename and page id
+    # (plain tuples: only the position of each page is needed)
+    page_ids = (
+        db_session.query(Page.id)
         .filter(Page.inventory_id == inventory_id)
         .join(Scan)
         .order_by(Scan.filename, Page.id)
         .all()
     )
 
-    if not pages:
+    if not page_ids:
         return {"groups": [], "items": []}
 
     # Create page index mapping
-    page_to_index = {page.id: idx for idx, page in enumerate(pages)}
+    page_to_index = {page_id: idx for idx, (page_id,) in enumerate(page_ids)}
+
+    # Page ids per document, as tuples rather than Page2Document objects
+    document_page_ids = defaultdict(list)
+    for document_id, page_id in fetch_document_page_ids(db_session, inventory_id):
+        document_page_ids[document_id].append(page_id)
 
     # Get all documents for this inventory grouped by method
     documents = (
         db_session.query(Document)
         .filter(Document.inventory_id == inventory_id)
         .join(DocumentIdentificationMethod)
+        .options(lazyload(Document.pages))
         .all()
     )
 
@@ -326,11 +483,11 @@ def prepare_timeline_data(db_session, inventory_id):
     items = []
     for doc in documents:
         # Get page indices for this document
-        if doc.pages:
+        if doc.id in document_page_ids:
             page_indices = [
-                page_to_index[p.page_id]
-                for p in doc.pages
-                if p.page_id in page_to_index
+                page_to_index[page_id]
+                for page_id in document_page_ids[doc.id]
+                if page_id in page_to_index
             ]
             if page_indices:
                 start_idx = min(page_indices)
@@ -354,13 +511,15 @@ def prepare_timeline_data(db_session, inventory_id):
     return {
         "groups": groups,
         "items": items,
-        "total_pages": len(pages) + 1,  # +1 for 1-based display range
+        "total_pages": len(page_ids) + 1,  # +1 for 1-based display range
     }
 
 
 @app.route("/documents")
 def documents():
     """List all documents."""
+    from sqlalchemy.orm import lazyload
+
     db_session = Session()
     page = request.args.get("page", 1, type=int)
     per_page = 20
@@ -368,7 +527,10 @@ def documents():
     # Search functionality
     search = request.args.get("search", "").strip()
 
-    doc_query = db_session.query(Document).join(Inventory)
+    # The list only shows number_of_pages: use page_count, not the page links
+    doc_query = (
+        db_session.query(Document).join(Inventory).options(lazyload(Document.pages))
+    )
 
     if search:
         doc_query = doc_query.filter(
@@ -396,7 +558,7 @@ def documents():
 def document_detail(document_id):
     """Show details of a specific document."""
     from sqlalchemy import case
-    from sqlalchemy.orm import joinedload
+    from sqlalchemy.orm import joinedload, lazyload
 
     db_session = Session()
     document = get_or_404(
@@ -405,6 +567,7 @@ def document_detail(document_id):
             joinedload(Document.document_types_linked).joinedload(
                 Document2DocumentType.document_type
             ),
+            DOCUMENT_EXTERNAL_IDS,
         )
         .filter_by(id=document_id)
     )
@@ -430,14 +593,23 @@ def document_detail(document_id):
     )
 
     # Get sub-documents
-    sub_documents = db_session.query(Document).filter_by(part_of_id=document_id).all()
+    sub_documents = (
+        db_session.query(Document)
+        .options(lazyload(Document.pages))
+        .filter_by(part_of_id=document_id)
+        .all()
+    )
 
     # Add scan filename information
     first_scan_filename = None
     last_scan_filename = None
     if page_docs:
-        first_page = db_session.query(Page).filter_by(id=page_docs[0].page_id).first()
-        last_page = db_session.query(Page).filter_by(id=page_docs[-1].page_id).first()
+        first_page = db_session.scalars(
+            PAGE_BY_ID, {"id": page_docs[0].page_id}
+        ).first()
+        last_page = db_session.scalars(
+            PAGE_BY_ID, {"id": page_docs[-1].page_id}
+        ).first()
 
         if first_page and first_page.scan:
             first_scan_filename = first_page.scan.filename
@@ -493,7 +665,7 @@ def scans():
 def scan_detail(filename):
     """Show details of a specific scan."""
     db_session = Session()
-    scan = get_or_404(db_session.query(Scan).filter_by(filename=filename))
+    scan = get_or_404(db_session.scalars(SCAN_BY_FILENAME, {"filename": filename}))
 
     # Get pages for this scan
     pages = db_session.query(Page).filter_by(scan_id=scan.id).all()
@@ -541,11 +713,18 @@ def pages():
 @app.route("/page/<page_id>")
 def page_detail(page_id):
     """Show details of a specific page."""
+    from sqlalchemy.orm import joinedload
+
     db_session = Session()
-    page = get_or_404(db_session.query(Page).filter_by(id=page_id))
+    page = get_or_404(db_session.scalars(PAGE_BY_ID, {"id": page_id}))
 
     # Get documents for this page
-    page_docs = db_session.query(Page2Document).filter_by(page_id=page_id).all()
+    page_docs = (
+        db_session.query(Page2Document)
+        .options(joinedload(Page2Document.document).lazyload(Document.pages))
+        .filter_by(page_id=page_id)
+        .all()
+    )
 
     # Get previous and next pages in the same inventory
     prev_page = None
@@ -583,12 +762,17 @@ def page_detail(page_id):
 @app.route("/settlements")
 def settlements():
     """List all canonical settlements imported from location_index.csv (step 6)."""
+    from sqlalchemy.orm import defaultload
+
     db_session = Session()
     page = request.args.get("page", 1, type=int)
     per_page = 50
     search = request.args.get("search", "").strip()
 
-    q = db_session.query(Settlement)
+    # The list only counts each settlement's documents: skip their page links
+    q = db_session.query(Settlement).options(
+        defaultload(Settlement.documents).lazyload(Document.pages)
+    )
 
     if search:
         # Match against glob_id or any of the settlement's labels
@@ -614,6 +798,8 @@ def settlements():
 @app.route("/settlement/<glob_id>")
 def settlement_detail(glob_id):
     """Show details and linked documents for a single settlement."""
+    from sqlalchemy.orm import lazyload
+
     db_session = Session()
     settlement = get_or_404(db_session.query(Settlement).filter_by(glob_id=glob_id))
 
@@ -622,6 +808,7 @@ def settlement_detail(glob_id):
 
     doc_query = (
         db_session.query(Document)
+        .options(lazyload(Document.pages))
         .filter_by(location_id=settlement.id)
         .order_by(Document.date_earliest_begin)
     )
@@ -642,6 +829,8 @@ def settlement_detail(glob_id):
 @app.route("/search")
 def search():
     """Global search across documents, inventories, scans, and settlements."""
+    from sqlalchemy.orm import lazyload
+
     db_session = Session()
     query = request.args.get("q", "").strip()
 
@@ -651,6 +840,7 @@ def search():
     # Search in documents
     docs = (
         db_session.query(Document)
+        .options(lazyload(Document.pages))
         .filter(Document.title.ilike(f"%{query}%"))
         .limit(20)
         .all()
@@ -693,12 +883,19 @@ def search():
 @app.route("/methods")
 def methods():
     """List all document identification methods."""
+    from sqlalchemy.orm import defaultload
+
     db_session = Session()
     page = request.args.get("page", 1, type=int)
     per_page = 50
 
-    method_query = db_session.query(DocumentIdentificationMethod).order_by(
-        DocumentIdentificationMethod.name
+    # The list only counts each method's documents: skip their page links
+    method_query = (
+        db_session.query(DocumentIdentificationMethod)
+        .options(
+            defaultload(DocumentIdentificationMethod.documents).lazyload(Document.pages)
+        )
+        .order_by(DocumentIdentificationMethod.name)
     )
 
     total = method_query.count()
@@ -778,6 +975,8 @@ def method_create():
 @app.route("/method/<method_id>")
 def method_detail(method_id):
     """Show details of a specific document identification method."""
+    from sqlalchemy.orm import lazyload
+
     db_session = Session()
     method = get_or_404(
         db_session.query(DocumentIdentificationMethod).filter_by(id=method_id)
@@ -787,7 +986,11 @@ def method_detail(method_id):
     page = request.args.get("page", 1, type=int)
     per_page = 20
 
-    doc_query = db_session.query(Document).filter_by(method_id=method_id)
+    doc_query = (
+        db_session.query(Document)
+        .options(lazyload(Document.pages))
+        .filter_by(method_id=method_id)
+    )
     total = doc_query.count()
     documents = doc_query.offset((page - 1) * per_page).limit(per_page).all()
     total_pages = (total + per_page - 1) // per_page
@@ -898,7 +1101,7 @@ def document_types():
 @app.route("/document-type/<type_id>")
 def document_type_detail(type_id):
     """Show all documents linked to a specific document type."""
-    from sqlalchemy.orm import joinedload
+    from sqlalchemy.orm import joinedload, lazyload
 
     db_session = Session()
     doc_type = get_or_404(db_session.query(DocumentType).filter_by(id=type_id))
@@ -918,6 +1121,7 @@ def document_type_detail(type_id):
             joinedload(Document.document_types_linked).joinedload(
                 Document2DocumentType.document_type
             ),
+            lazyload(Document.pages),
         )
         .offset((page - 1) * per_page)
         .limit(per_page)
@@ -938,47 +1142,58 @@ def document_type_detail(type_id):
 @app.route("/scan/<filename>/jsonld")
 def scan_jsonld(filename):
     db_session = Session()
-    scan = get_or_404(db_session.query(Scan).filter_by(filename=filename))
+    scan = get_or_404(db_session.scalars(SCAN_BY_FILENAME, {"filename": filename}))
     data = scan_to_jsonld(scan)
 
-    return Response(
-        json.dumps(data, ensure_ascii=False, indent=2), mimetype="application/ld+json"
-    )
+    return jsonld_response(data)
 
 
 @app.route("/page/<page_id>/jsonld")
 def page_jsonld(page_id):
     db_session = Session()
-    page = get_or_404(db_session.query(Page).filter_by(id=page_id))
+    page = load_page_for_api(db_session, page_id)
+    if page is None:
+        abort(404)
     data = page_to_jsonld(page)
 
-    return Response(
-        json.dumps(data, ensure_ascii=False, indent=2), mimetype="application/ld+json"
-    )
+    return jsonld_response(data)
 
 
 @app.route("/document/<document_id>/jsonld")
 def document_physical_jsonld(document_id):
     db_session = Session()
-    document = get_or_404(db_session.query(Document).filter_by(id=document_id))
+    document = load_document_for_api(db_session, document_id)
+    if document is None:
+        abort(404)
     data = document_physical_to_jsonld(document)
 
-    return Response(
-        json.dumps(data, ensure_ascii=False, indent=2), mimetype="application/ld+json"
-    )
+    return jsonld_response(data)
 
 
 @app.route("/inventory/<inventory_number>/jsonld")
 def inventory_jsonld(inventory_number):
+    from sqlalchemy.orm import selectinload
+
     db_session = Session()
+    # The serializer walks every document (and its settlement) of the
+    # inventory; load them with a fixed number of IN queries instead of
+    # one lazy SELECT per document.
     inventory = get_or_404(
-        db_session.query(Inventory).filter_by(inventory_number=inventory_number)
+        db_session.query(Inventory)
+        .options(
+            selectinload(Inventory.titles),
+            selectinload(Inventory.member_of_series),
+            selectinload(Inventory.documents)
+            .selectinload(Document.location)
+            .selectinload(Settlement.labels),
+            # Documents are only referenced, not expanded into their pages
+            selectinload(Inventory.documents).lazyload(Document.pages),
+        )
+        .filter_by(inventory_number=inventory_number)
     )
     data = inventory_to_jsonld(inventory)
 
-    return Response(
-        json.dumps(data, ensure_ascii=False, indent=2), mimetype="application/ld+json"
-    )
+    return jsonld_response(data)
 
 
 @app.route("/inventory/<inventory_number>/manifest")
@@ -990,11 +1205,52 @@ def inventory_manifest(inventory_number):
 
     manifest_uri = f"https://data.globalise.huygens.knaw.nl/hdl:20.500.14722/inventory:{inventory_number}.manifest"
 
-    data = inventory_to_manifest_jsonld(inventory, manifest_uri)
-
-    return Response(
-        json.dumps(data, ensure_ascii=False, indent=2), mimetype="application/ld+json"
-    )
+    inventory_id = inventory.id
+    collect = manifest_cache_enabled()
+    if collect:
+        cache_key = (inventory_id, manifest_fingerprint(db_session, inventory))
+        cached = manifest_cache_get(cache_key)
+        if cached is not None:
+            body, etag = cached
+            response = Response(body, mimetype="application/ld+json")
+            response.set_etag(etag)
+            return response.make_conditional(request)
+
+    # Streamed responses carry no ETag: it is a hash of the complete body,
+    # which is only known once the manifest has been sent and cached
+
+    def generate():
+        # Canvases are serialized one at a time while the response is sent.
+        # Flask pops the view's context (running Session.remove) when the view
+        # returns and stream_with_context pushes it again here, so reload the
+        # inventory. populate_existing applies the loader options (and their
+        # raiseload) even when the scoped session still holds the inventory.
+        streamed = Session().get(
+            Inventory,
+            inventory_id,
+            options=MANIFEST_INVENTORY_OPTIONS,
+            populate_existing=True,
+        )
+        caching = collect
+        chunks = []
+        collected = 0
+        # One write per ~256 KiB instead of one per canvas
+        for chunk in BufferedBytesIter(
+            inventory_to_manifest_jsonld_stream(streamed, manifest_uri)
+        ):
+            if caching:
+                chunks.append(chunk)
+                collected += len(chunk)
+                # Too large to cache: stop holding on to it
+                if collected > app.config["MANIFEST_CACHE_MAX_BYTES"]:
+                    caching = False
+                    chunks = []
+            yield chunk
+        # Only cache manifests that were sent completely
+        if caching:
+            manifest_cache_put(cache_key, b"".join(chunks))
+
+    return Response(stream_with_context(generate()), mimetype="application/ld+json")
 
 
 @app.route("/series/<series_id>/jsonld")
@@ -1003,9 +1259,7 @@ def series_jsonld(series_id):
     series = get_or_404(db_session.query(Series).filter_by(id=series_id))
     data = series_to_jsonld(series)
 
-    return Response(
-        json.dumps(data, ensure_ascii=False, indent=2), mimetype="application/ld+json"
-    )
+    return jsonld_response(data)
 
 
 # Template filters
@@ -4,19 +4,199 @@ Moved out of app.py to keep routes lean.
 """
 
 import re
-from typing import Any, Dict, List, Optional
+from collections import defaultdict
+from functools import lru_cache
+from operator import attrgetter
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 
-from models import Document, RectoVerso
+import orjson
+from sqlalchemy import select
+from sqlalchemy.orm import object_session
 
+from models import Document, Page, RectoVerso, Scan
+from queries import fetch_inventory_tree
 
+# Whitespace/underscore runs (group 1) become a hyphen, other invalid
+# characters are dropped: both rules applied in a single pass
+_SLUG_RE = re.compile(r"([\s_]+)|[^a-z0-9\-]")
+
+
+def _slug_replacement(match: re.Match) -> str:
+    return "-" if match.group(1) else ""
+
+
+# Sort key for Page2Document links (C-level attribute lookup instead of a lambda)
+_PAGE_INDEX_KEY = attrgetter("index")
+
+
+def _scan_filename_key(scan) -> str:
+    """Sort key ordering scans by filename, with missing filenames first."""
+    return scan.filename or ""
+
+
+# Invariant URL prefixes, concatenated in the per-document and per-scan loops
+_DOCUMENT_ID_PREFIX = (
+    "https://data.globalise.huygens.knaw.nl/hdl:20.500.14722/document:"
+)
+_CANVAS_ID_PREFIX = "https://data.globalise.huygens.knaw.nl/hdl:20.500.14722/canvas:"
+_PAINTING_ANNOTATIONS_PREFIX = (
+    "https://data.globalise.huygens.knaw.nl/hdl:20.500.14722/annotations:painting:"
+)
+_TRANSCRIPTIONS_PREFIX = "https://data.globalise.huygens.knaw.nl/hdl:20.500.14722/annotations:transcriptions:"
+_ENTITIES_PREFIX = (
+    "https://data.globalise.huygens.knaw.nl/hdl:20.500.14722/annotations:entities:"
+)
+_EVENTS_PREFIX = (
+    "https://data.globalise.huygens.knaw.nl/hdl:20.500.14722/annotations:events:"
+)
+_SERIES_ID_PREFIX = "https://data.globalise.huygens.knaw.nl/hdl:20.500.14722/series:"
+
+
+# Getty AAT classification blocks shared by every serialized object. The
+# output is only ever read (serialized), so one instance of each is enough;
+# never mutate them.
+_AAT_DIGITIZED_IMAGE = {
+    "id": "http://vocab.getty.edu/aat/300417380",
+    "type": "Type",
+    "_label": "Digitized image",
+}
+_AAT_HEIGHT = {
+    "id": "http://vocab.getty.edu/aat/300055644",
+    "type": "Type",
+    "_label": "Height",
+}
+_AAT_WIDTH = {
+    "id": "http://vocab.getty.edu/aat/300055647",
+    "type": "Type",
+    "_label": "Width",
+}
+_AAT_PIXELS_UNIT = {
+    "id": "http://vocab.getty.edu/aat/300266190",
+    "type": "MeasurementUnit",
+    "_label": "pixels",
+}
+_AAT_PART_TYPE = {
+    "id": "http://vocab.getty.edu/aat/300241583",
+    "type": "Type",
+    "_label": "Part Type",
+}
+_AAT_RECTO = {
+    "id": "http://vocab.getty.edu/aat/300078817",
+    "type": "Type",
+    "_label": "Recto",
+    "classified_as": [_AAT_PART_TYPE],
+}
+_AAT_VERSO = {
+    "id": "http://vocab.getty.edu/aat/300010292",
+    "type": "Type",
+    "_label": "Verso",
+    "classified_as": [_AAT_PART_TYPE],
+}
+# Generic part type fallback
+_AAT_PAGE = {
+    "id": "http://vocab.getty.edu/aat/300241583",
+    "type": "Type",
+    "_label": "Page",
+    "classified_as": [_AAT_PART_TYPE],
+}
+# Part classification and folio suffix per recto/verso side
+_RV_TABLE = {
+    RectoVerso.RECTO: (_AAT_RECTO, "r"),
+    RectoVerso.VERSO: (_AAT_VERSO, "v"),
+}
+_RV_UNKNOWN = (_AAT_PAGE, "")
+_AAT_COUNT_OF_PAGES = {
+    "id": "http://vocab.getty.edu/aat/300404433",
+    "type": "Type",
+    "_label": "Count of",
+}
+_AAT_PAGES_UNIT = {
+    "id": "http://vocab.getty.edu/aat/300194222",
+    "type": "MeasurementUnit",
+    "_label": "Pages",
+}
+_AAT_NUMBER_OF_SCANS = {
+    "id": "http://vocab.getty.edu/aat/300404433",
+    "type": "Type",
+    "_label": "Number of scans",
+}
+_AAT_DIGITIZED_IMAGES_UNIT = {
+    "id": "http://vocab.getty.edu/aat/300417380",
+    "type": "MeasurementUnit",
+    "_label": "Digitized images",
+}
+_AAT_ARCHIVAL_SUBGROUPING = {
+    "id": "http://vocab.getty.edu/aat/300404023",
+    "type": "Type",
+    "_label": "Archival Subseries (subgroups)",
+}
+_AAT_ARCHIVAL_GROUPING = {
+    "id": "http://vocab.getty.edu/aat/300404022",
+    "type": "Type",
+    "_label": "Archival Grouping",
+}
+_AAT_PRIMARY_NAME = {
+    "id": "http://vocab.getty.edu/aat/300404670",
+    "type": "Type",
+    "_label": "Primary Name",
+}
+_AAT_FILE_UNIT = {
+    "id": "http://vocab.getty.edu/aat/300027046",
+    "type": "Type",
+    "_label": "File unit",
+}
+_AAT_ACCESSION_NUMBER = {
+    "id": "http://vocab.getty.edu/aat/300312355",
+    "type": "Type",
+    "_label": "Accession number",
+}
+_AAT_ENTRY_NUMBER = {
+    "id": "http://vocab.getty.edu/aat/300445023",
+    "type": "Type",
+    "_label": "Entry number",
+}
+_AAT_WEB_PAGE = {
+    "id": "http://vocab.getty.edu/aat/300264578",
+    "type": "Type",
+    "_label": "Web Page",
+}
+_AAT_PLAIN_TEXT = {
+    "id": "http://vocab.getty.edu/aat/300460247",
+    "type": "Type",
+    "_label": "Plain text",
+}
+
+
+def dumps_jsonld(obj: Any) -> bytes:
+    """Serialize a JSON-LD / IIIF structure to indented UTF-8 bytes.
+
+    Same layout as json.dumps(obj, ensure_ascii=False, indent=2), but orjson
+    walks these large nested trees several times faster.
+    """
+    return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+
+
+def _compact(obj: Any) -> Any:
+    """Recursively drop None-valued keys from dicts (list items are kept).
+
+    None placeholders carry no meaning in JSON-LD, so leaving them out only
+    shrinks the payload and the serializer's work.
+    """
+    if isinstance(obj, dict):
+        return {k: _compact(v) for k, v in obj.items() if v is not None}
+    if isinstance(obj, list):
+        return [_compact(v) for v in obj]
+    return obj
+
+
+# Document type strings repeat heavily across the corpus
+@lru_cache(maxsize=1024)
 def slugify(value: str) -> str:
     """Simple slugify: lowercase, replace spaces/underscores with hyphens, strip non-alnum-hyphen."""
     if not value:
         return "unknown"
 
-    v = value.lower().strip()
-    v = re.sub(r"[\s_]+", "-", v)
-    v = re.sub(r"[^a-z0-9\-]", "", v)
+    v = _SLUG_RE.sub(_slug_replacement, value.lower().strip())
     return v or "unknown"
 
 
@@ -24,19 +204,13 @@ def slugify(value: str) -> str:
 # Some fields are placeholders or require further mapping
 
 
-def scan_to_jsonld(scan) -> Dict[str, Any]:
-    return {
+def scan_to_jsonld(scan, compact: bool = True) -> Dict[str, Any]:
+    result: Dict[str, Any] = {
         "@context": "https://linked.art/ns/v1/linked-art.json",
         "id": f"urn:uuid:{scan.id}",
         "type": "DigitalObject",
         "_label": f"Scan {scan.filename}",
-        "classified_as": [
-            {
-                "id": "http://vocab.getty.edu/aat/300417380",
-                "type": "Type",
-                "_label": "Digitized image",
-            }
-        ],
+        "classified_as": [_AAT_DIGITIZED_IMAGE],
         "identified_by": [
             {
                 "type": "Identifier",
@@ -52,31 +226,15 @@ def scan_to_jsonld(scan) -> Dict[str, Any]:
         "dimension": [
             {
                 "type": "Dimension",
-                "classified_as": {
-                    "id": "http://vocab.getty.edu/aat/300055644",
-                    "type": "Type",
-                    "_label": "Height",
-                },
+                "classified_as": _AAT_HEIGHT,
                 "value": scan.height,
-                "unit": {
-                    "id": "http://vocab.getty.edu/aat/300266190",
-                    "type": "MeasurementUnit",
-                    "_label": "pixels",
-                },
+                "unit": _AAT_PIXELS_UNIT,
             },
             {
                 "type": "Dimension",
-                "classified_as": {
-                    "id": "http://vocab.getty.edu/aat/300055647",
-                    "type": "Type",
-                    "_label": "Width",
-                },
+                "classified_as": _AAT_WIDTH,
                 "value": scan.width,
-                "unit": {
-                    "id": "http://vocab.getty.edu/aat/300266190",
-                    "type": "MeasurementUnit",
-                    "_label": "pixels",
-                },
+                "unit": _AAT_PIXELS_UNIT,
             },
         ],
         "access_point": {
@@ -88,54 +246,30 @@ def scan_to_jsonld(scan) -> Dict[str, Any]:
         "digitally_carries": None,
         "digitally_shows": None,
     }
+    return _compact(result) if compact else result
 
 
 # Helper to serialize a Page to JSON-LD (preliminary, can be extended)
 # Some fields are placeholders or require further mapping
 
 
-def page_to_jsonld(page) -> Dict[str, Any]:
+def page_to_jsonld(page, compact: bool = True) -> Dict[str, Any]:
     # Compose the id using a placeholder pattern; adjust as needed for your real IDs
-    page_id_url = (
-        f"https://data.globalise.huygens.knaw.nl/hdl:20.500.14722/document:{page.id}"
-    )
+    page_id_url = _DOCUMENT_ID_PREFIX + page.id
     # Determine recto/verso classification id and label
-    if page.recto_verso == RectoVerso.RECTO:
-        classification_id = "http://vocab.getty.edu/aat/300078817"  # Recto
-        recto_verso_label = "Recto"
-    elif page.recto_verso == RectoVerso.VERSO:
-        classification_id = "http://vocab.getty.edu/aat/300010292"  # Verso
-        recto_verso_label = "Verso"
-    else:
-        classification_id = (
-            "http://vocab.getty.edu/aat/300241583"  # Generic part type fallback???
-        )
-        recto_verso_label = "Page"
+    classification = _RV_TABLE.get(page.recto_verso, _RV_UNKNOWN)[0]
 
     # Shallow reference to the associated Scan (if present)
     scan_ref = None
     if page.scan is not None:
-        scan_ref = scan_to_jsonld(page.scan)
+        scan_ref = scan_to_jsonld(page.scan, compact=False)
 
-    return {
+    result: Dict[str, Any] = {
         "@context": "https://linked.art/ns/v1/linked-art.json",
         "id": page_id_url,
         "type": "PhysicalHumanMadeThing",
         "_label": f"Page {page.page_or_folio_number or page.id[:8]}",
-        "classified_as": [
-            {
-                "id": classification_id,
-                "type": "Type",
-                "_label": recto_verso_label,
-                "classified_as": [
-                    {
-                        "id": "http://vocab.getty.edu/aat/300241583",
-                        "type": "Type",
-                        "_label": "Part Type",
-                    }
-                ],
-            }
-        ],
+        "classified_as": [classification],
         "carries": {
             "id": None,  # TODO: supply LinguisticObject id when available
             "type": "LinguisticObject",
@@ -154,6 +288,7 @@ def page_to_jsonld(page) -> Dict[str, Any]:
             "digitally_shown_by": scan_ref,
         },
     }
+    return _compact(result) if compact else result
 
 
 # Physical Document JSON-LD (material manifestation of a conceptual document)
@@ -162,11 +297,11 @@ def page_to_jsonld(page) -> Dict[str, Any]:
 def settlement_to_place_jsonld(settlement) -> Dict[str, Any]:
     """Serialize a Settlement to a Linked Art Place object."""
     labels = []
-    if getattr(settlement, "labels", None):
+    if settlement.labels:
         labels = [
             lbl.label.strip()
             for lbl in settlement.labels
-            if getattr(lbl, "label", None) and lbl.label.strip()
+            if lbl.label and lbl.label.strip()
         ]
 
     deduped_labels = list(dict.fromkeys(labels))
@@ -177,7 +312,7 @@ def settlement_to_place_jsonld(settlement) -> Dict[str, Any]:
         "_label": place_label,
     }
 
-    if getattr(settlement, "glob_id", None):
+    if settlement.glob_id:
         place_obj["id"] = (
             "https://data.globalise.huygens.knaw.nl/hdl:20.500.14722/"
             f"place:{settlement.glob_id}"
@@ -247,7 +382,7 @@ def language_code_to_jsonld(code: str) -> Optional[Dict[str, Any]]:
 
 def scan_languages_jsonld(scan) -> List[Dict[str, Any]]:
     """Map a single Scan's raw `languages` field to a list of known Language objects."""
-    raw = getattr(scan, "languages", None) if scan is not None else None
+    raw = scan.languages if scan is not None else None
     if not raw:
         return []
 
@@ -270,7 +405,7 @@ def document_languages_jsonld(document) -> List[Dict[str, Any]]:
     seen = set()
     for link in document.pages or []:
         pg = link.page
-        scan = getattr(pg, "scan", None) if pg else None
+        scan = pg.scan if pg else None
         for lang in scan_languages_jsonld(scan):
             key = lang.get("id") or lang.get("_label")
             if key in seen:
@@ -280,8 +415,31 @@ def document_languages_jsonld(document) -> List[Dict[str, Any]]:
     return languages
 
 
-def document_physical_to_jsonld(document) -> Dict[str, Any]:
-    base_id = f"https://data.globalise.huygens.knaw.nl/hdl:20.500.14722/document:{document.id}"
+@lru_cache(maxsize=256)
+def _document_type_classified(
+    type_id: str, pref_label_en: Optional[str], pref_label_nl: Optional[str]
+) -> Dict[str, Any]:
+    """Build the classified_as entry for a thesaurus document type.
+
+    A handful of types cover most documents, so the entry is built once per
+    distinct type and shared between documents. Callers must not mutate it.
+    """
+    doc_type_str = pref_label_en or pref_label_nl or type_id
+    pref_label = []
+    if pref_label_nl:
+        pref_label.append({"@language": "nl", "@value": pref_label_nl})
+    if pref_label_en:
+        pref_label.append({"@language": "en", "@value": pref_label_en})
+    return {
+        "id": f"https://data.globalise.huygens.knaw.nl/hdl:20.500.14722/thesaurus:{type_id}",
+        "type": "Type",
+        "_label": f"{doc_type_str} (document type)",
+        "prefLabel": pref_label,
+    }
+
+
+def document_physical_to_jsonld(document, compact: bool = True) -> Dict[str, Any]:
+    base_id = _DOCUMENT_ID_PREFIX + document.id
     # Classification from linked (thesaurus) document types
     classified = []
     if document.document_types_linked:
@@ -289,24 +447,13 @@ def document_physical_to_jsonld(document) -> Dict[str, Any]:
             dt = dt_link.document_type
             if dt is None:
                 continue
-            doc_type_str = dt.pref_label_en or dt.pref_label_nl or dt.id
-            pref_label = []
-            if dt.pref_label_nl:
-                pref_label.append({"@language": "nl", "@value": dt.pref_label_nl})
-            if dt.pref_label_en:
-                pref_label.append({"@language": "en", "@value": dt.pref_label_en})
             classified.append(
-                {
-                    "id": f"https://data.globalise.huygens.knaw.nl/hdl:20.500.14722/thesaurus:{dt.id}",
-                    "type": "Type",
-                    "_label": f"{doc_type_str} (document type)",
-                    "prefLabel": pref_label,
-                }
+                _document_type_classified(dt.id, dt.pref_label_en, dt.pref_label_nl)
             )
 
     # Title object
     title_obj = None
-    if getattr(document, "title", None):
+    if document.title:
         title_obj = {
             "type": "Title",
             "content": document.title,
@@ -315,23 +462,23 @@ def document_physical_to_jsonld(document) -> Dict[str, Any]:
 
     # Timespan
     timespan = None
-    if (getattr(document, "date_earliest_begin", None) is not None) or (
-        getattr(document, "date_latest_end", None) is not None
+    if (document.date_earliest_begin is not None) or (
+        document.date_latest_end is not None
     ):
         timespan = {
             "type": "Timespan",
             "begin_of_the_begin": (
                 str(document.date_earliest_begin) + "T00:00:00Z"
-                if getattr(document, "date_earliest_begin", None) is not None
+                if document.date_earliest_begin is not None
                 else None
             ),
             "end_of_the_end": (
                 str(document.date_latest_end) + "T23:59:59Z"
-                if getattr(document, "date_latest_end", None) is not None
+                if document.date_latest_end is not None
                 else None
             ),
         }
-        if getattr(document, "date_text", None):
+        if document.date_text:
             timespan["referred_to_by"] = {
                 "id": "",
                 "type": "LinguisticObject",
@@ -341,60 +488,47 @@ def document_physical_to_jsonld(document) -> Dict[str, Any]:
 
     # Parts: physical pages (recto/verso) from Page2Document
     parts: List[Dict[str, Any]] = []
+    # Scan reference and languages per scan id: the recto and verso pages of
+    # a double scan share one scan, which only needs serializing once.
+    scan_parts: Dict[str, Tuple[Dict[str, Any], Optional[List[Dict[str, Any]]]]] = {}
     if document.pages:
         # Order by index
-        sorted_page_links = sorted(document.pages, key=lambda p: p.index)
+        sorted_page_links = sorted(document.pages, key=_PAGE_INDEX_KEY)
         for link in sorted_page_links:
             pg = link.page
+            # Determine recto/verso classification and folio suffix
+            classification, suffix = _RV_TABLE.get(pg.recto_verso, _RV_UNKNOWN)
             label: Optional[str]
-            if pg.page_or_folio_number and pg.recto_verso:
-                suffix = "r" if pg.recto_verso == RectoVerso.RECTO else "v"
+            if pg.page_or_folio_number and suffix:
                 label = f"Fol. {pg.page_or_folio_number}{suffix}"
             elif pg.page_or_folio_number:
                 label = f"Page {pg.page_or_folio_number}"
             else:
                 label = f"Physical Page {pg.id[:8]}"
 
-            # Determine recto/verso classification
-            if pg.recto_verso == RectoVerso.RECTO:
-                classification_id = "http://vocab.getty.edu/aat/300078817"  # Recto
-                recto_verso_label = "Recto"
-            elif pg.recto_verso == RectoVerso.VERSO:
-                classification_id = "http://vocab.getty.edu/aat/300010292"  # Verso
-                recto_verso_label = "Verso"
-            else:
-                classification_id = (
-                    "http://vocab.getty.edu/aat/300241583"  # Generic part
-                )
-                recto_verso_label = "Page"
-
             # Build scan reference if available
             scan_ref = None
+            page_languages = None
             if pg.scan:
-                scan_ref = scan_to_jsonld(pg.scan)
+                cached = scan_parts.get(pg.scan.id)
+                if cached is None:
+                    cached = scan_parts[pg.scan.id] = (
+                        scan_to_jsonld(pg.scan, compact=False),
+                        scan_languages_jsonld(pg.scan) or None,
+                    )
+                scan_ref, page_languages = cached
 
             # Create detailed part with carries and shows
             part: Dict[str, Any] = {
                 # "id": f"https://data.globalise.huygens.knaw.nl/hdl:20.500.14722/document:{document.id}#page:{pg.id}",
                 "type": "PhysicalHumanMadeThing",
                 "_label": label,
-                "classified_as": {
-                    "id": classification_id,
-                    "type": "Type",
-                    "_label": recto_verso_label,
-                    "classified_as": [
-                        {
-                            "id": "http://vocab.getty.edu/aat/300241583",
-                            "type": "Type",
-                            "_label": "Part Type",
-                        }
-                    ],
-                },
+                "classified_as": classification,
                 "carries": {
                     "id": None,  # TODO: reference PageXML/text resource when available
                     "type": "LinguisticObject",
                     "_label": "Textual content of the page",
-                    "language": scan_languages_jsonld(pg.scan) or None,
+                    "language": page_languages,
                     "digitally_carried_by": {
                         "id": None,  # TODO: reference PageXML service
                         "type": "DigitalObject",
@@ -419,8 +553,7 @@ def document_physical_to_jsonld(document) -> Dict[str, Any]:
 
     # Identifiers: the two possible external identifiers (e.g. OBP_INDEX, TANAP)
     identified_by = []
-    for ext_link in getattr(document, "external_ids", None) or []:
-        ext = ext_link.external
+    for ext in document.externals:
         if ext is None:
             continue
 
@@ -463,35 +596,19 @@ def document_physical_to_jsonld(document) -> Dict[str, Any]:
     dimension = [
         {
             "type": "Dimension",
-            "classified_as": {
-                "id": "http://vocab.getty.edu/aat/300404433",
-                "type": "Type",
-                "_label": "Count of",
-            },
+            "classified_as": _AAT_COUNT_OF_PAGES,
             "value": number_of_pages,
-            "unit": {
-                "id": "http://vocab.getty.edu/aat/300194222",
-                "type": "MeasurementUnit",
-                "_label": "Pages",
-            },
+            "unit": _AAT_PAGES_UNIT,
         },
         {
             "type": "Dimension",
-            "classified_as": {
-                "id": "http://vocab.getty.edu/aat/300404433",
-                "type": "Type",
-                "_label": "Number of scans",
-            },
+            "classified_as": _AAT_NUMBER_OF_SCANS,
             "value": number_of_scans,
-            "unit": {
-                "id": "http://vocab.getty.edu/aat/300417380",
-                "type": "MeasurementUnit",
-                "_label": "Digitized images",
-            },
+            "unit": _AAT_DIGITIZED_IMAGES_UNIT,
         },
     ]
 
-    return {
+    result: Dict[str, Any] = {
         "@context": "https://linked.art/ns/v1/linked-art.json",
         "id": base_id,
         "type": "PhysicalHumanMadeThing",
@@ -516,53 +633,38 @@ def document_physical_to_jsonld(document) -> Dict[str, Any]:
         },
         "subject_of": subject_of,
     }
+    return _compact(result) if compact else result
 
 
 # Series (Set) JSON-LD
 
 
 def series_to_jsonld(series) -> Dict[str, Any]:
-    series_id = (
-        f"https://data.globalise.huygens.knaw.nl/hdl:20.500.14722/series:{series.id}"
-    )
+    series_id = _SERIES_ID_PREFIX + series.id
 
     # Determine classification based on hierarchy level
     # If it has a parent, it's likely a sub-grouping; otherwise a top-level grouping
-    if getattr(series, "part_of_id", None) is not None:
-        classified_as = {
-            "id": "http://vocab.getty.edu/aat/300404023",
-            "type": "Type",
-            "_label": "Archival Subseries (subgroups)",
-        }
+    if series.part_of_id is not None:
+        classified_as = _AAT_ARCHIVAL_SUBGROUPING
     else:
-        classified_as = {
-            "id": "http://vocab.getty.edu/aat/300404022",
-            "type": "Type",
-            "_label": "Archival Grouping",
-        }
+        classified_as = _AAT_ARCHIVAL_GROUPING
 
     # Identified by Name
     identified_by = [
         {
             "type": "Name",
-            "classified_as": [
-                {
-                    "id": "http://vocab.getty.edu/aat/300404670",
-                    "type": "Type",
-                    "_label": "Primary Name",
-                }
-            ],
+            "classified_as": [_AAT_PRIMARY_NAME],
             "content": series.title,
         }
     ]
 
     # Member of (parent Series if exists)
     member_of = None
-    if getattr(series, "part_of", None) is not None:
+    if series.part_of is not None:
         parent = series.part_of
         member_of = [
             {
-                "id": f"https://data.globalise.huygens.knaw.nl/hdl:20.500.14722/series:{parent.id}",
+                "id": _SERIES_ID_PREFIX + parent.id,
                 "type": "Set",
                 "_label": parent.title,
             }
@@ -586,46 +688,74 @@ def series_to_jsonld(series) -> Dict[str, Any]:
 # Inventory (CuratedHolding) JSON-LD
 
 
-def inventory_to_jsonld(inventory) -> Dict[str, Any]:
+def _series_chain(series, chains: Dict[str, Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Nested Set for a Series, the Series outermost and each parent nested in
+    its child's member_of. Chains are memoized by series id in `chains`, so
+    ancestors shared by many inventories are only built once.
+    """
+    # Walk up to the first ancestor whose chain is already built
+    path = []
+    node = series
+    while node is not None and node.id not in chains:
+        path.append(node)
+        node = node.part_of
+
+    parent_chain = chains[node.id] if node is not None else None
+    for s in reversed(path):
+        chain: Dict[str, Any] = {
+            # "id": f"https://data.globalise.huygens.knaw.nl/hdl:20.500.14722/series:{s.id}",
+            "type": "Set",
+            "_label": s.title,
+        }
+        if parent_chain is not None:
+            chain["member_of"] = parent_chain
+        chains[s.id] = parent_chain = chain
+
+    return chains[series.id]
+
+
+def inventory_to_jsonld(
+    inventory,
+    compact: bool = True,
+    series_chains: Optional[Dict[str, Dict[str, Any]]] = None,
+) -> Dict[str, Any]:
+    """
+    Linked Art CuratedHolding for the Inventory. Pass the same
+    `series_chains` dict when serializing many inventories to share the
+    series chains between them.
+    """
     inv_id = f"https://data.globalise.huygens.knaw.nl/hdl:20.500.14722/inventory:{inventory.inventory_number}"
 
     # Include all titles from inventory
     title_obj = []
-    if getattr(inventory, "titles", None) and inventory.titles:
+    if inventory.titles:
         for title in inventory.titles:
             title_obj.append({"type": "Title", "content": title.title})
 
     # Timespan
     timespan = None
-    if (getattr(inventory, "date_start", None) is not None) or (
-        getattr(inventory, "date_end", None) is not None
-    ):
+    if (inventory.date_start is not None) or (inventory.date_end is not None):
         timespan = {
             "type": "Timespan",
             "begin_of_the_begin": (
-                str(inventory.date_start)
-                if getattr(inventory, "date_start", None) is not None
-                else None
+                str(inventory.date_start) if inventory.date_start is not None else None
             ),
             "end_of_the_end": (
-                str(inventory.date_end)
-                if getattr(inventory, "date_end", None) is not None
-                else None
+                str(inventory.date_end) if inventory.date_end is not None else None
             ),
         }
 
     # Derive production places from settlements linked to documents in this inventory.
     place_candidates: List[Dict[str, Any]] = []
     seen_place_keys = set()
-    if getattr(inventory, "documents", None):
+    if inventory.documents:
         for doc in inventory.documents:
-            settlement = getattr(doc, "location", None)
+            settlement = doc.location
             if not settlement:
                 continue
 
-            place_key = getattr(settlement, "id", None) or getattr(
-                settlement, "glob_id", None
-            )
+            place_key = settlement.id or settlement.glob_id
             if place_key in seen_place_keys:
                 continue
             seen_place_keys.add(place_key)
@@ -654,7 +784,7 @@ def inventory_to_jsonld(inventory) -> Dict[str, Any]:
 
     # Parts: physical documents within inventory with full structure (pages as parts)
     parts: List[Dict[str, Any]] = []
-    if getattr(inventory, "documents", None):
+    if inventory.documents:
         for doc in inventory.documents:  # limit to avoid huge payloads
             # # Get the full document structure with pages as parts
             # doc_jsonld = document_physical_to_jsonld(doc)
@@ -664,43 +794,22 @@ def inventory_to_jsonld(inventory) -> Dict[str, Any]:
 
             # Get the shallow document reference (without pages) to avoid huge payloads
             doc_ref = {
-                "id": f"https://data.globalise.huygens.knaw.nl/hdl:20.500.14722/document:{doc.id}",
+                "id": _DOCUMENT_ID_PREFIX + doc.id,
                 "type": "PhysicalHumanMadeThing",
                 "_label": title,
             }
             parts.append(doc_ref)
 
-    handle = inventory.handle if getattr(inventory, "handle", None) else None
+    handle = inventory.handle or None
 
     # Build member_of from real series relationships with nested parent chain per series
-    def series_chain(s) -> Dict[str, Any]:
-        # Build list from leaf to root
-        chain = []
-        current = s
-        while current is not None:
-            chain.append(current)
-            current = current.part_of
-
-        # Build nested structure from root to leaf (so root is last/outermost)
-        node: Optional[Dict[str, Any]] = None
-        for series_obj in reversed(chain):
-            current_node: Dict[str, Any] = {
-                # "id": f"https://data.globalise.huygens.knaw.nl/hdl:20.500.14722/series:{series_obj.id}",
-                "type": "Set",
-                "_label": series_obj.title,
-            }
-            if node is not None:
-                current_node["member_of"] = node
-            node = current_node
-
-        assert node is not None
-        return node
-
+    if series_chains is None:
+        series_chains = {}
     member_of_list: List[Dict[str, Any]] = []
-    if getattr(inventory, "member_of_series", None):
+    if inventory.member_of_series:
         for s in inventory.member_of_series:
 
-            member_of_list.append(series_chain(s))
+            member_of_list.append(_series_chain(s, series_chains))
 
     result: Dict[str, Any] = {
         "@context": "https://linked.art/ns/v1/linked-art.json",
@@ -708,34 +817,16 @@ def inventory_to_jsonld(inventory) -> Dict[str, Any]:
         "type": "CuratedHolding",
         "_label": f"Inventory {inventory.inventory_number}",
         # Classified_as as a single object (per provided example)
-        "classified_as": [
-            {
-                "id": "http://vocab.getty.edu/aat/300027046",  # File unit
-                "type": "Type",
-                "_label": "File unit",
-            }
-        ],
+        "classified_as": [_AAT_FILE_UNIT],
         "identified_by": [
             {
                 "type": "Identifier",
-                "classified_as": [
-                    {
-                        "id": "http://vocab.getty.edu/aat/300312355",
-                        "type": "Type",
-                        "_label": "Accession number",
-                    }
-                ],
+                "classified_as": [_AAT_ACCESSION_NUMBER],
                 "content": inventory.inventory_number,
             },
             {
                 "type": "Identifier",
-                "classified_as": [
-                    {
-                        "id": "http://vocab.getty.edu/aat/300445023",
-                        "type": "Type",
-                        "_label": "Entry number",
-                    }
-                ],
+                "classified_as": [_AAT_ENTRY_NUMBER],
                 "content": inventory.id,
             },
         ],
@@ -753,13 +844,7 @@ def inventory_to_jsonld(inventory) -> Dict[str, Any]:
                     {
                         "type": "DigitalObject",
                         "_label": f"Inventory {inventory.inventory_number} at the National Archives",
-                        "classified_as": [
-                            {
-                                "id": "http://vocab.getty.edu/aat/300264578",
-                                "type": "Type",
-                                "_label": "Web Page",
-                            }
-                        ],
+                        "classified_as": [_AAT_WEB_PAGE],
                         "access_point": {
                             "id": handle,
                             "type": "DigitalObject",
@@ -776,7 +861,7 @@ def inventory_to_jsonld(inventory) -> Dict[str, Any]:
                         "access_point": [
                             # Shallow reference
                             {
-                                "id": f"https://data.globalise.huygens.knaw.nl/hdl:20.500.14722/inventory:{inventory.inventory_number}.manifest",
+                                "id": inv_id + ".manifest",
                                 "type": "DigitalObject",  # Also Manifest?
                                 "_label": f"IIIF Manifest for Inventory {inventory.inventory_number}",
                             }
@@ -801,50 +886,297 @@ def inventory_to_jsonld(inventory) -> Dict[str, Any]:
             "_label": "Textual content of the inventory",
             "digitally_carried_by": {
                 # txt file
-                "id": f"https://data.globalise.huygens.knaw.nl/hdl:20.500.14722/inventory:{inventory.inventory_number}.txt",
+                "id": inv_id + ".txt",
                 "type": "DigitalObject",
                 "_label": f"Plain text of Inventory {inventory.inventory_number}",
-                "classified_as": {
-                    "id": "http://vocab.getty.edu/aat/300460247",
-                    "type": "Type",
-                    "_label": "Plain text",
-                },
+                "classified_as": _AAT_PLAIN_TEXT,
                 "format": "text/plain",
             },
         },
     }
 
-    return result
+    return _compact(result) if compact else result
 
 
-def inventory_to_manifest_jsonld(inventory, manifest_uri: str) -> Dict[str, Any]:
+def _manifest_scan_rows(inventory) -> List[Any]:
     """
-    Generate a IIIF Presentation 3.0 Manifest for the Inventory
+    Fetch the columns the Manifest needs for all Scans of the Inventory in
+    one query, sorted by filename
+    """
+    rows = (
+        object_session(inventory)
+        .execute(
+            select(
+                Scan.id,
+                Scan.filename,
+                Scan.height,
+                Scan.width,
+                Scan.na_identifier,
+                Scan.iiif_image_info,
+                Scan.has_transcriptions,
+                Scan.has_entities,
+                Scan.has_events,
+            ).where(Scan.inventory_id == inventory.id)
+        )
+        .all()
+    )
+    # Sort in Python so the order does not depend on the database collation
+    rows.sort(key=_scan_filename_key)
+    return rows
+
+
+def _recto_verso_labels(inventory) -> Dict[str, str]:
+    """
+    Map each Scan id of the Inventory to the Recto/Verso label of its Pages
+    """
+    # The database deduplicates the (scan, side) pairs; joining the at most two
+    # sides stays in Python because string_agg/group_concat are not portable
+    # and neither guarantees an order.
+    sides: Dict[str, List[str]] = defaultdict(list)
+    for scan_id, recto_verso in object_session(inventory).execute(
+        select(Page.scan_id, Page.recto_verso)
+        .distinct()
+        .join(Scan, Page.scan_id == Scan.id)
+        .where(Scan.inventory_id == inventory.id, Page.recto_verso.is_not(None))
+    ):
+        sides[scan_id].append(recto_verso.value)
+    # Combine unique values
+    return {
+        scan_id: uniq[0] if len(uniq) == 1 else ", ".join(sorted(uniq))
+        for scan_id, uniq in sides.items()
+    }
+
+
+# Fixed skeleton of a manifest Canvas as compact JSON; only the %(...)s
+# fields vary per scan and are filled in with already-encoded JSON values.
+_CANVAS_JSON_TEMPLATE = (
+    b'{"id":%(canvas_id)s,"type":"Canvas","label":{"en":[%(filename)s]},'
+    b'"height":%(height)s,"width":%(width)s,"metadata":%(metadata)s,'
+    b'"items":[{"id":%(annotation_page_id)s,"type":"AnnotationPage",'
+    b'"items":[{"id":%(annotation_id)s,"type":"Annotation","motivation":"painting",'
+    b'"body":{"id":%(image_id)s,"type":"Image","format":"image/jpeg",'
+    b'"height":%(height)s,"width":%(width)s,"service":[{"id":%(service_id)s,'
+    b'"type":"ImageService3","profile":"level2"}]},"target":%(canvas_id)s}]}],'
+    b'"annotations":%(annotations)s}'
+)
+_CANVAS_ID_PREFIX_JSON = b'"' + _CANVAS_ID_PREFIX.encode()
+_PAINTING_ANNOTATIONS_PREFIX_JSON = b'"' + _PAINTING_ANNOTATIONS_PREFIX.encode()
+
+
+def _canvas_json(
+    filename: str,
+    height: Optional[int],
+    width: Optional[int],
+    na_identifier: Optional[str],
+    iiif_image_info: Optional[str],
+    rv_label: Optional[str],
+    has_transcriptions: bool,
+    has_entities: bool,
+    has_events: bool,
+) -> bytes:
+    """
+    Render one IIIF Presentation 3.0 Canvas as compact JSON from plain
+    column values (no ORM objects)
+    """
+    dumps = orjson.dumps
+    # Encode the filename once; the ids built from it only add a prefix
+    # that needs no escaping.
+    filename_json = dumps(filename)
+    canvas_id = _CANVAS_ID_PREFIX_JSON + filename_json[1:]
+    annotation_page_id = _PAINTING_ANNOTATIONS_PREFIX_JSON + filename_json[1:]
+
+    # Same URLs as Scan.get_image_url(size="max") and the IIIF Image
+    # service id from info.json, if available
+    image_id = b'""'
+    service_id = b"null"
+    if iiif_image_info:
+        info_json = dumps(iiif_image_info)
+        image_id = info_json.replace(b"info.json", b"full/max/0/default.jpg")
+        service_id = info_json.replace(b"/info.json", b"")
+
+    # Metadata entries similar to the example (Filename, Web)
+    # Use the filename directly; only include Web if `na_identifier` is a URL
+    web_url = None
+    if na_identifier:
+        nai = str(na_identifier)
+        if nai.startswith("http://") or nai.startswith("https://"):
+            web_url = nai
+
+    # Filename is always present; Web link and Recto/Verso are optional.
+    # Build the final list in one go rather than appending afterwards.
+    canvas_metadata: List[Dict[str, Any]] = [
+        {"label": {"en": ["Filename"]}, "value": {"none": [filename]}},
+        *(
+            [
+                {
+                    "label": {"en": ["Web"]},
+                    "value": {"none": [f'<a href="{web_url}">{web_url}</a>']},
+                }
+            ]
+            if web_url
+            else []
+        ),
+        *(
+            [{"label": {"en": ["Recto/Verso"]}, "value": {"none": [rv_label]}}]
+            if rv_label
+            else []
+        ),
+    ]
+
+    # Add annotation pages for transcriptions, entities, and events (only if available)
+    annotations = []
+
+    if has_transcriptions:
+        annotations.append(
+            {
+                "id": _TRANSCRIPTIONS_PREFIX + filename,
+                "type": "AnnotationPage",
+                "label": {"en": [f"Transcriptions of scan {filename}"]},
+            }
+        )
+    if has_entities:
+        annotations.append(
+            {
+                "id": _ENTITIES_PREFIX + filename,
+                "type": "AnnotationPage",
+                "label": {"en": [f"Entities identified on scan {filename}"]},
+            }
+        )
+    if has_events:
+        annotations.append(
+            {
+                "id": _EVENTS_PREFIX + filename,
+                "type": "AnnotationPage",
+                "label": {"en": [f"Events identified on scan {filename}"]},
+            }
+        )
+
+    return _CANVAS_JSON_TEMPLATE % {
+        b"canvas_id": canvas_id,
+        b"filename": filename_json,
+        b"height": dumps(height),
+        b"width": dumps(width),
+        b"metadata": dumps(canvas_metadata),
+        b"annotation_page_id": annotation_page_id,
+        b"annotation_id": annotation_page_id[:-1] + b'#annotation"',
+        b"image_id": image_id,
+        b"service_id": service_id,
+        b"annotations": dumps(annotations),
+    }
+
+
+def _iter_canvases_json(scan_rows, rv_labels: Dict[str, str]) -> Iterator[bytes]:
+    """
+    Yield a IIIF Presentation 3.0 Canvas as compact JSON for each Scan row,
+    in the given order
+    """
+    for (
+        scan_id,
+        filename,
+        height,
+        width,
+        na_identifier,
+        iiif_image_info,
+        has_transcriptions,
+        has_entities,
+        has_events,
+    ) in scan_rows:
+        yield _canvas_json(
+            filename,
+            height,
+            width,
+            na_identifier,
+            iiif_image_info,
+            rv_labels.get(scan_id),
+            has_transcriptions,
+            has_entities,
+            has_events,
+        )
+
+
+@lru_cache(maxsize=256)
+def _en_label(label: str) -> Dict[str, List[str]]:
+    """Shared {"en": [label]} map for a metadata label; never mutate it."""
+    return {"en": [label]}
+
+
+def _mk_meta(label: str, value: Any) -> Dict[str, Any]:
+    """IIIF metadata entry with an English label and a language-neutral value."""
+    return {"label": _en_label(label), "value": {"none": [value]}}
+
+
+# Blocks that are the same in every manifest. The dict output shares these
+# objects; the streamed output splices their pre-encoded JSON instead.
+_MANIFEST_CONTEXT = [
+    "https://linked.art/ns/v1/linked-art.json",
+    "http://iiif.io/api/extension/navplace/context.json",
+    "http://iiif.io/api/presentation/3/context.json",
+]
+_MANIFEST_REQUIRED_STATEMENT = {
+    "label": {"en": ["Attribution"]},
+    "value": {
+        "en": [
+            '<span>GLOBALISE Project. <a href="https://creativecommons.org/publicdomain/zero/1.0/"> <img src="https://licensebuttons.net/l/zero/1.0/88x31.png" alt="CC0 1.0 Universal (CC0 1.0) Public Domain Dedication"/> </a> </span>'
+        ]
+    },
+}
+_MANIFEST_PROVIDER = [
+    {
+        "id": "https://globalise.huygens.knaw.nl",
+        "type": "Agent",
+        "label": {"en": ["GLOBALISE Project"]},
+        "homepage": [
+            {
+                "id": "https://globalise.huygens.knaw.nl",
+                "type": "Text",
+                "label": {"en": ["GLOBALISE Project"]},
+                "format": "text/html",
+            }
+        ],
+        "logo": [
+            {
+                "id": "https://objectstore.surf.nl/87435b768620494e8e911c83d1997f24:globalise-data/static/img/globalise.png",
+                "type": "Image",
+                "height": 182,
+                "width": 1200,
+                "format": "image/png",
+            }
+        ],
+    }
+]
+_MANIFEST_STATIC_FRAGMENTS = {
+    "@context": orjson.Fragment(orjson.dumps(_MANIFEST_CONTEXT)),
+    "requiredStatement": orjson.Fragment(orjson.dumps(_MANIFEST_REQUIRED_STATEMENT)),
+    "provider": orjson.Fragment(orjson.dumps(_MANIFEST_PROVIDER)),
+}
+
+
+def _manifest_without_items(inventory, manifest_uri: str, scan_rows) -> Dict[str, Any]:
+    """
+    Build the Manifest for the Inventory with an empty list of canvases
     """
 
     # Metadata values for top-level IIIF Presentation 3.0 manifest metadata.
     title_values: List[str] = []
-    if getattr(inventory, "titles", None):
-        title_values = [t.title for t in inventory.titles if getattr(t, "title", None)]
+    if inventory.titles:
+        title_values = [t.title for t in inventory.titles if t.title]
 
     collection_values: List[str] = []
-    if getattr(inventory, "member_of_series", None):
-        collection_values = [
-            s.title for s in inventory.member_of_series if getattr(s, "title", None)
-        ]
+    if inventory.member_of_series:
+        collection_values = [s.title for s in inventory.member_of_series if s.title]
 
     settlement_values: List[str] = []
-    if getattr(inventory, "documents", None):
+    if inventory.documents:
         for doc in inventory.documents:
-            location = getattr(doc, "location", None)
+            location = doc.location
             if not location:
                 continue
-            if getattr(location, "labels", None) and location.labels:
-                first_label = getattr(location.labels[0], "label", None)
+            if location.labels:
+                first_label = location.labels[0].label
                 if first_label:
                     settlement_values.append(first_label)
                     continue
-            glob_id = getattr(location, "glob_id", None)
+            glob_id = location.glob_id
             if glob_id:
                 settlement_values.append(glob_id)
 
@@ -874,11 +1206,11 @@ def inventory_to_manifest_jsonld(inventory, manifest_uri: str) -> Dict[str, Any]
         else None
     )
 
-    if getattr(inventory, "date_start", None) and getattr(inventory, "date_end", None):
+    if inventory.date_start and inventory.date_end:
         date_value = f"{inventory.date_start} / {inventory.date_end}"
-    elif getattr(inventory, "date_start", None):
+    elif inventory.date_start:
         date_value = str(inventory.date_start)
-    elif getattr(inventory, "date_end", None):
+    elif inventory.date_end:
         date_value = str(inventory.date_end)
     else:
         date_value = None
@@ -886,9 +1218,7 @@ def inventory_to_manifest_jsonld(inventory, manifest_uri: str) -> Dict[str, Any]
     manifest_metadata: List[Dict[str, Any]] = [
         {
             "label": {"en": ["Inventory number"], "nl": ["Inventarisnummer"]},
-            "value": {
-                "none": [str(getattr(inventory, "inventory_number", "") or "") or None]
-            },
+            "value": {"none": [str(inventory.inventory_number or "") or None]},
         },
         {
             "label": {"en": ["Collection"], "nl": ["Collectie"]},
@@ -908,52 +1238,18 @@ def inventory_to_manifest_jsonld(inventory, manifest_uri: str) -> Dict[str, Any]
         },
         {
             "label": {"en": ["Handle"], "nl": ["Handle"]},
-            "value": {"none": [str(getattr(inventory, "handle", "") or "") or None]},
+            "value": {"none": [str(inventory.handle or "") or None]},
         },
     ]
 
     manifest: Dict[str, Any] = {
-        "@context": [
-            "https://linked.art/ns/v1/linked-art.json",
-            "http://iiif.io/api/extension/navplace/context.json",
-            "http://iiif.io/api/presentation/3/context.json",
-        ],
+        "@context": _MANIFEST_CONTEXT,
         "id": manifest_uri,
         "type": "Manifest",
         "label": {"en": [f"Inventory {inventory.inventory_number}"]},
-        "requiredStatement": {
-            "label": {"en": ["Attribution"]},
-            "value": {
-                "en": [
-                    '<span>GLOBALISE Project. <a href="https://creativecommons.org/publicdomain/zero/1.0/"> <img src="https://licensebuttons.net/l/zero/1.0/88x31.png" alt="CC0 1.0 Universal (CC0 1.0) Public Domain Dedication"/> </a> </span>'
-                ]
-            },
-        },
+        "requiredStatement": _MANIFEST_REQUIRED_STATEMENT,
         "rights": "http://creativecommons.org/publicdomain/zero/1.0/",
-        "provider": [
-            {
-                "id": "https://globalise.huygens.knaw.nl",
-                "type": "Agent",
-                "label": {"en": ["GLOBALISE Project"]},
-                "homepage": [
-                    {
-                        "id": "https://globalise.huygens.knaw.nl",
-                        "type": "Text",
-                        "label": {"en": ["GLOBALISE Project"]},
-                        "format": "text/html",
-                    }
-                ],
-                "logo": [
-                    {
-                        "id": "https://objectstore.surf.nl/87435b768620494e8e911c83d1997f24:globalise-data/static/img/globalise.png",
-                        "type": "Image",
-                        "height": 182,
-                        "width": 1200,
-                        "format": "image/png",
-                    }
-                ],
-            }
-        ],
+        "provider": _MANIFEST_PROVIDER,
         "metadata": manifest_metadata,
         "items": [],
         "seeAlso": [
@@ -966,185 +1262,69 @@ def inventory_to_manifest_jsonld(inventory, manifest_uri: str) -> Dict[str, Any]
     }
 
     # Add navDate if inventory has date information
-    if getattr(inventory, "date_start", None):
+    if inventory.date_start:
         manifest["navDate"] = f"{inventory.date_start}T00:00:00+00:00"
-    elif getattr(inventory, "date_end", None):
+    elif inventory.date_end:
         manifest["navDate"] = f"{inventory.date_end}T00:00:00+00:00"
 
-    # Add Canvas for each Inventory's Scan (avoid document linkage)
-    if getattr(inventory, "scans", None):
-        # Sort scans by filename for consistent ordering
-        sorted_scans = sorted(inventory.scans, key=lambda s: s.filename or "")
-        for scan in sorted_scans:
-            canvas_id = f"https://data.globalise.huygens.knaw.nl/hdl:20.500.14722/canvas:{scan.filename}"
-            # Determine recto/verso from related pages, if present
-            rv_label = None
-            if getattr(scan, "pages", None):
-                rv_values = [
-                    p.recto_verso.value
-                    for p in scan.pages
-                    if getattr(p, "recto_verso", None)
-                ]
-                if len(rv_values) == 1:
-                    rv_label = rv_values[0]
-                elif len(rv_values) > 1:
-                    # Combine unique values
-                    uniq = sorted(set(rv_values))
-                    rv_label = ", ".join(uniq)
-
-            image_id = scan.get_image_url(size="max") or ""
-            # IIIF Image service id from info.json, if available
-            service_id = None
-            if getattr(scan, "iiif_image_info", None):
-                service_id = scan.iiif_image_info.replace("/info.json", "")
-
-            # Metadata entries similar to the example (Filename, Web)
-            # Use scan.filename directly; only include Web if `na_identifier` is a URL
-            web_url = None
-            if getattr(scan, "na_identifier", None):
-                nai = str(scan.na_identifier)
-                if nai.startswith("http://") or nai.startswith("https://"):
-                    web_url = nai
-
-            label_text = scan.filename
-
-            canvas_obj: Dict[str, Any] = {
-                "id": canvas_id,
-                "type": "Canvas",
-                "label": {"en": [label_text]},
-                "height": scan.height,
-                "width": scan.width,
-                "metadata": [
-                    {
-                        "label": {"en": ["Filename"]},
-                        "value": {"none": [scan.filename]},
-                    },
-                ],
-                "items": [
-                    {
-                        "id": f"https://data.globalise.huygens.knaw.nl/hdl:20.500.14722/annotations:painting:{scan.filename}",
-                        "type": "AnnotationPage",
-                        "items": [
-                            {
-                                "id": f"https://data.globalise.huygens.knaw.nl/hdl:20.500.14722/annotations:painting:{scan.filename}#annotation",
-                                "type": "Annotation",
-                                "motivation": "painting",
-                                "body": {
-                                    "id": image_id,
-                                    "type": "Image",
-                                    "format": "image/jpeg",
-                                    "height": scan.height,
-                                    "width": scan.width,
-                                    "service": [
-                                        {
-                                            "id": service_id,
-                                            "type": "ImageService3",
-                                            "profile": "level2",
-                                        }
-                                    ],
-                                },
-                                "target": canvas_id,
-                            }
-                        ],
-                    }
-                ],
-                "annotations": [],
-            }
-
-            # Add annotation pages for transcriptions, entities, and events (only if available)
-            annotations = []
-            if getattr(scan, "has_transcriptions", False):
-                annotations.append(
-                    {
-                        "id": f"https://data.globalise.huygens.knaw.nl/hdl:20.500.14722/annotations:transcriptions:{scan.filename}",
-                        "type": "AnnotationPage",
-                        "label": {"en": [f"Transcriptions of scan {scan.filename}"]},
-                    }
-                )
-            if getattr(scan, "has_entities", False):
-                annotations.append(
-                    {
-                        "id": f"https://data.globalise.huygens.knaw.nl/hdl:20.500.14722/annotations:entities:{scan.filename}",
-                        "type": "AnnotationPage",
-                        "label": {
-                            "en": [f"Entities identified on scan {scan.filename}"]
-                        },
-                    }
-                )
-            if getattr(scan, "has_events", False):
-                annotations.append(
-                    {
-                        "id": f"https://data.globalise.huygens.knaw.nl/hdl:20.500.14722/annotations:events:{scan.filename}",
-                        "type": "AnnotationPage",
-                        "label": {"en": [f"Events identified on scan {scan.filename}"]},
-                    }
-                )
-            if annotations:
-                canvas_obj["annotations"] = annotations
-
-            # Optional metadata: Web link and Recto/Verso info
-            if web_url:
-                canvas_obj["metadata"].append(
-                    {
-                        "label": {"en": ["Web"]},
-                        "value": {"none": [f'<a href="{web_url}">{web_url}</a>']},
-                    }
-                )
-            if rv_label:
-                canvas_obj["metadata"].append(
-                    {
-                        "label": {"en": ["Recto/Verso"]},
-                        "value": {"none": [rv_label]},
-                    }
-                )
-
-            manifest["items"].append(canvas_obj)
-
     # Add thumbnail from first scan if available
-    if manifest["items"] and getattr(inventory, "scans", None):
-        first_scan = sorted(inventory.scans, key=lambda s: s.filename or "")[0]
-        if first_scan:
-            thumb_id = first_scan.get_image_url(size="982,") or ""
-            service_id = None
-            if getattr(first_scan, "iiif_image_info", None):
-                service_id = first_scan.iiif_image_info.replace("/info.json", "")
-
-            if thumb_id and service_id:
-                manifest["thumbnail"] = [
-                    {
-                        "id": thumb_id,
-                        "type": "Image",
-                        "height": first_scan.height,
-                        "width": first_scan.width,
-                        "service": [
-                            {
-                                "@id": service_id,
-                                "@type": "ImageService2",
-                                "profile": "http://iiif.io/api/image/2/level1",
-                                "format": "image/jpeg",
-                            }
-                        ],
-                        "format": "image/jpeg",
-                    }
-                ]
+    if scan_rows:
+        first_scan = scan_rows[0]
+        thumb_id = ""
+        first_service_id = None
+        if first_scan.iiif_image_info:
+            thumb_id = first_scan.iiif_image_info.replace(
+                "info.json", "full/982,/0/default.jpg"
+            )
+            first_service_id = first_scan.iiif_image_info.replace("/info.json", "")
+        if thumb_id and first_service_id:
+            manifest["thumbnail"] = [
+                {
+                    "id": thumb_id,
+                    "type": "Image",
+                    "height": first_scan.height,
+                    "width": first_scan.width,
+                    "service": [
+                        {
+                            "@id": first_service_id,
+                            "@type": "ImageService2",
+                            "profile": "http://iiif.io/api/image/2/level1",
+                            "format": "image/jpeg",
+                        }
+                    ],
+                    "format": "image/jpeg",
+                }
+            ]
 
     # Add Range for each Document in Inventory
     # Create IIIF Presentation 3.0 structures (ranges) for navigation
-    if getattr(inventory, "documents", None):
+    if inventory.documents:
+        # Range ids share the manifest prefix; build it once per inventory
+        range_prefix = f"https://data.globalise.huygens.knaw.nl/hdl:20.500.14722/inventory:{inventory.inventory_number}.manifest/range/"
+
         # Create a top-level Range for table of contents
         top_range: Dict[str, Any] = {
-            "id": f"https://data.globalise.huygens.knaw.nl/hdl:20.500.14722/inventory:{inventory.inventory_number}.manifest/range/top",
+            "id": range_prefix + "top",
             "type": "Range",
             "label": {"en": ["Table of Contents"], "nl": ["Inhoudsopgave"]},
             "items": [],
         }
 
+        # Page links of every document (subdocuments included) in page order,
+        # with their scan filenames, in one query: no Page2Document, Page or
+        # Scan objects are loaded for the ranges
+        first_index: Dict[str, int] = {}
+        scan_filenames: Dict[str, List[str]] = defaultdict(list)
+        for row in fetch_inventory_tree(object_session(inventory), inventory.id):
+            first_index.setdefault(row["document_id"], row["index"])
+            if row["filename"] is not None:
+                scan_filenames[row["document_id"]].append(row["filename"])
+        no_pages = float("inf")
+
         # Sort documents by their first page index to maintain order
         def get_first_page_index(doc):
             """Get the index of the first page in a document for sorting."""
-            if doc.pages:
-                return min(p.index for p in doc.pages)
-            return float("inf")
+            return first_index.get(doc.id, no_pages)
 
         # Only process top-level documents (those without a parent)
         top_level_docs = [doc for doc in inventory.documents if doc.part_of_id is None]
@@ -1167,7 +1347,7 @@ def inventory_to_manifest_jsonld(inventory, manifest_uri: str) -> Dict[str, Any]
                 label_text = f"Document {doc.id[:8]}"
 
             doc_range: Dict[str, Any] = {
-                "id": f"https://data.globalise.huygens.knaw.nl/hdl:20.500.14722/inventory:{inventory.inventory_number}.manifest/range/{range_id_suffix}",
+                "id": range_prefix + range_id_suffix,
                 "type": "Range",
                 "label": {"en": [label_text]},
                 "metadata": [],
@@ -1175,100 +1355,60 @@ def inventory_to_manifest_jsonld(inventory, manifest_uri: str) -> Dict[str, Any]
             }
 
             # Add metadata to the range
+            metadata = doc_range["metadata"]
             # Title
             if doc.title:
-                doc_range["metadata"].append(
-                    {
-                        "label": {"en": ["Title"]},
-                        "value": {"en": [doc.title]},
-                    }
+                metadata.append(
+                    {"label": _en_label("Title"), "value": {"en": [doc.title]}}
                 )
 
             # Date
-            if doc.date_text:
-                doc_range["metadata"].append(
-                    {
-                        "label": {"en": ["Date"]},
-                        "value": {"none": [doc.date_text]},
-                    }
-                )
-            elif doc.date_earliest_begin or doc.date_latest_end:
-                date_str = ""
+            date_str = doc.date_text
+            if not date_str:
                 if doc.date_earliest_begin and doc.date_latest_end:
                     date_str = f"{doc.date_earliest_begin} / {doc.date_latest_end}"
                 elif doc.date_earliest_begin:
                     date_str = str(doc.date_earliest_begin)
                 elif doc.date_latest_end:
                     date_str = str(doc.date_latest_end)
-                if date_str:
-                    doc_range["metadata"].append(
-                        {
-                            "label": {"en": ["Date"]},
-                            "value": {"none": [date_str]},
-                        }
-                    )
+            if date_str:
+                metadata.append(_mk_meta("Date", date_str))
 
             # Type (from linked document types)
-            if doc.document_types_linked:
-                for dt_link in doc.document_types_linked:
-                    dt = dt_link.document_type
-                    if dt is None:
-                        continue
+            for dt_link in doc.document_types_linked or ():
+                dt = dt_link.document_type
+                if dt is not None:
                     label = dt.pref_label_en or dt.pref_label_nl or dt.id
-                    doc_range["metadata"].append(
-                        {
-                            "label": {"en": ["Type"]},
-                            "value": {"none": [label]},
-                        }
-                    )
+                    metadata.append(_mk_meta("Type", label))
 
             # Inventory number
-            doc_range["metadata"].append(
-                {
-                    "label": {"en": ["Inventory number"]},
-                    "value": {"none": [inventory.inventory_number]},
-                }
-            )
+            metadata.append(_mk_meta("Inventory number", inventory.inventory_number))
 
             # External IDs (TANAP-id, etc.)
-            if doc.external_ids:
-                for ext_id_link in doc.external_ids:
-                    ext = ext_id_link.external
-                    if ext.context and ext.identifier:
-                        # Add with context label (e.g., "TANAP-id")
-                        label_text = (
-                            "TANAP-id"
-                            if ext.context.upper() == "TANAP"
-                            else f"{ext.context} ID"
-                        )
-                        doc_range["metadata"].append(
-                            {
-                                "label": {"en": [label_text]},
-                                "value": {"none": [ext.identifier]},
-                            }
-                        )
+            for ext in doc.externals:
+                if ext.context and ext.identifier:
+                    # Add with context label (e.g., "TANAP-id")
+                    label_text = (
+                        "TANAP-id"
+                        if ext.context.upper() == "TANAP"
+                        else f"{ext.context} ID"
+                    )
+                    metadata.append(_mk_meta(label_text, ext.identifier))
 
             # Document UUID identifier
-            doc_range["metadata"].append(
-                {
-                    "label": {"en": ["Identifier"]},
-                    "value": {"none": [doc.id]},
-                }
-            )
+            metadata.append(_mk_meta("Identifier", doc.id))
 
             # Link to the document physical metadata (via seeAlso)
             doc_range["seeAlso"] = [
                 {
-                    "id": f"https://data.globalise.huygens.knaw.nl/hdl:20.500.14722/document:{doc.id}",
+                    "id": _DOCUMENT_ID_PREFIX + doc.id,
                     "type": "HumanMadeObject",
                     "label": {"en": ["Document metadata"]},
                 }
             ]
 
             # Check if this document has subdocuments
-            has_subdocuments = bool(
-                getattr(doc, "sub_documents", None) and len(doc.sub_documents) > 0
-            )
+            has_subdocuments = bool(doc.sub_documents)
 
             if has_subdocuments:
                 # If it has subdocuments, add them as nested ranges
@@ -1280,22 +1420,15 @@ def inventory_to_manifest_jsonld(inventory, manifest_uri: str) -> Dict[str, Any]
                     doc_range["items"].append(subdoc_range)
             else:
                 # No subdocuments, add canvas references for this document's pages
-                if doc.pages:
-                    # Sort pages by index
-                    sorted_page_links = sorted(doc.pages, key=lambda p: p.index)
-                    # Track seen canvas IDs to avoid duplicates (2 pages can share 1 scan)
-                    seen_canvas_ids = set()
-                    for link in sorted_page_links:
-                        page = link.page
-                        if page.scan:
-                            # Reference the canvas by scan identifier
-                            canvas_id = f"https://data.globalise.huygens.knaw.nl/hdl:20.500.14722/canvas:{page.scan.filename}"
-                            # Only add if not already in the list
-                            if canvas_id not in seen_canvas_ids:
-                                seen_canvas_ids.add(canvas_id)
-                                doc_range["items"].append(
-                                    {"id": canvas_id, "type": "Canvas"}
-                                )
+                # Reference the canvas by scan identifier; dict.fromkeys keeps
+                # the first occurrence only (2 pages can share 1 scan)
+                canvas_ids = dict.fromkeys(
+                    _CANVAS_ID_PREFIX + filename
+                    for filename in scan_filenames.get(doc.id, ())
+                )
+                doc_range["items"].extend(
+                    {"id": canvas_id, "type": "Canvas"} for canvas_id in canvas_ids
+                )
 
             return doc_range
 
@@ -1309,3 +1442,40 @@ def inventory_to_manifest_jsonld(inventory, manifest_uri: str) -> Dict[str, Any]
             manifest["structures"] = [top_range]
 
     return manifest
+
+
+def inventory_to_manifest_jsonld(inventory, manifest_uri: str) -> Dict[str, Any]:
+    """
+    Generate a IIIF Presentation 3.0 Manifest for the Inventory
+    """
+    # Scan columns and recto/verso labels are fetched in two queries up front,
+    # instead of lazy-loading each Scan's Pages inside the canvas loop
+    scan_rows = _manifest_scan_rows(inventory)
+    manifest = _manifest_without_items(inventory, manifest_uri, scan_rows)
+    # Canvases only exist as JSON; decode them in one call rather than one
+    # per canvas. Writers should use inventory_to_manifest_jsonld_stream.
+    canvases = _iter_canvases_json(scan_rows, _recto_verso_labels(inventory))
+    manifest["items"] = orjson.loads(b"[" + b",".join(canvases) + b"]")
+    return manifest
+
+
+def inventory_to_manifest_jsonld_stream(
+    inventory, manifest_uri: str
+) -> Iterator[bytes]:
+    """
+    Generate the Manifest for the Inventory as compact JSON, chunk by chunk.
+
+    Each canvas is serialized as soon as it is built, so the full list of
+    canvases is never held in memory. "items" is written as the last key.
+    """
+    scan_rows = _manifest_scan_rows(inventory)
+    manifest = _manifest_without_items(inventory, manifest_uri, scan_rows)
+    del manifest["items"]
+    # Same keys, same positions: only the values become pre-encoded JSON
+    manifest.update(_MANIFEST_STATIC_FRAGMENTS)
+    yield orjson.dumps(manifest)[:-1] + b',"items":['
+    separator = b""
+    for canvas in _iter_canvases_json(scan_rows, _recto_verso_labels(inventory)):
+        yield separator + canvas
+        separator = b","
+    yield b"]}"
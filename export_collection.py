@@ -6,7 +6,6 @@ Generates a gzipped JSON file ready for upload to the object store alongside the
 """
 
 import gzip
-import json
 import os
 import time
 
@@ -14,6 +13,7 @@ from sqlalchemy import create_engine, func
 from sqlalchemy.orm import Session, selectinload
 
 from models import Inventory, InventoryTitle, Scan
+from export import dumps_jsonld
 
 DATABASE_URL = os.environ.get("DATABASE_URL", "sqlite:///globalise_documents.db")
 OUTPUT_DIR = os.environ.get("MANIFEST_OUTPUT_DIR", "data/s3/objects/inventory/")
@@ -77,7 +77,7 @@ def export_collection():
             first_scan = sorted(inventory.scans, key=lambda s: s.filename or "")[0]
             thumb_url = first_scan.get_image_url(size="982,")
             service_id = None
-            if getattr(first_scan, "iiif_image_info", False):
+            if first_scan.iiif_image_info:
                 service_id = first_scan.iiif_image_info.replace("/info.json", "")
             if thumb_url and service_id:
                 manifest_ref["thumbnail"] = [
@@ -173,7 +173,7 @@ def export_collection():
     }
 
     out_path = os.path.join(OUTPUT_DIR, "collection.json")
-    json_bytes = json.dumps(collection, ensure_ascii=False, indent=2).encode("utf-8")
+    json_bytes = dumps_jsonld(collection)
 
     with gzip.open(out_path, "wb") as f:
         f.write(json_bytes)
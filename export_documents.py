@@ -11,7 +11,6 @@ Output paths:
 """
 
 import gzip
-import json
 import os
 import time
 
@@ -19,7 +18,12 @@ from sqlalchemy import create_engine
 from sqlalchemy.orm import Session, selectinload
 
 from models import Inventory, Document, Series
-from export import document_physical_to_jsonld, inventory_to_jsonld, series_to_jsonld
+from export import (
+    document_physical_to_jsonld,
+    dumps_jsonld,
+    inventory_to_jsonld,
+    series_to_jsonld,
+)
 
 DATABASE_URL = os.environ.get("DATABASE_URL", "sqlite:///globalise_documents.db")
 OUTPUT_DIR = os.environ.get("DOCUMENTS_OUTPUT_DIR", "data/s3/objects")
@@ -53,13 +57,15 @@ def export_documents():
     t0 = time.time()
 
     # 1. Export Inventories
+    # Series chains are shared by many inventories; build each one once
+    series_chains: dict = {}
     for i, inventory in enumerate(inventories, 1):
-        inv_data = inventory_to_jsonld(inventory)
+        inv_data = inventory_to_jsonld(inventory, series_chains=series_chains)
 
         # Override the seeAlso embedding and subject_of if necessary (this logic
         # has been moved to export.py, but here we just directly serialize the JSON-LD).
         out_path = os.path.join(inv_dir, f"{inventory.inventory_number}.json")
-        json_bytes = json.dumps(inv_data, ensure_ascii=False, indent=2).encode("utf-8")
+        json_bytes = dumps_jsonld(inv_data)
 
         with gzip.open(out_path, "wb") as f:
             f.write(json_bytes)
@@ -113,7 +119,7 @@ def export_documents():
             s_data["member"] = members
 
         out_path = os.path.join(inv_dir, f"series_{s.id}.json")
-        json_bytes = json.dumps(s_data, ensure_ascii=False, indent=2).encode("utf-8")
+        json_bytes = dumps_jsonld(s_data)
         with gzip.open(out_path, "wb") as f:
             f.write(json_bytes)
 
@@ -194,7 +200,7 @@ def export_documents():
     }
     set_out_path = os.path.join(inv_dir, "set.json")
     with gzip.open(set_out_path, "wb") as f:
-        f.write(json.dumps(set_data, ensure_ascii=False, indent=2).encode("utf-8"))
+        f.write(dumps_jsonld(set_data))
     print(f"Exported global Set object to {set_out_path}")
 
     # How to save 500K files?
@@ -219,7 +225,7 @@ def export_documents():
         doc_data = document_physical_to_jsonld(doc)
 
         out_path = os.path.join(doc_dir, f"{doc.id}.json")
-        json_bytes = json.dumps(doc_data, ensure_ascii=False, indent=2).encode("utf-8")
+        json_bytes = dumps_jsonld(doc_data)
 
         with gzip.open(out_path, "wb") as f:
             f.write(json_bytes)
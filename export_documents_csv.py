@@ -18,9 +18,10 @@ import csv
 import argparse
 import gzip
 import logging
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, func, select
 from sqlalchemy.orm import Session
 from models import Base, Document
+from queries import iter_in_batches
 
 # Configure logging
 logging.basicConfig(
@@ -171,10 +172,11 @@ def export_documents_csv(
         gzip_output: When True, gzip-compress the output file.
     """
     with Session(engine) as session:
-        # Query all documents
-        documents = session.query(Document).all()
+        # Stream documents in batches rather than loading them all at once
+        total = session.scalar(select(func.count(Document.id)))
+        documents = iter_in_batches(session, select(Document))
 
-        logger.info(f"Found {len(documents)} documents to export")
+        logger.info(f"Found {total} documents to export")
 
         os.makedirs(os.path.dirname(output_file), exist_ok=True)
         open_fn = gzip.open if gzip_output else open
@@ -226,15 +228,13 @@ def export_documents_csv(
                 )
 
         if gzip_output:
-            logger.info(
-                f"Exported {len(documents)} documents to gzip file {output_file}"
-            )
+            logger.info(f"Exported {total} documents to gzip file {output_file}")
             logger.info(
                 "Upload with: aws s3 sync data/s3/document/ s3://globalise-data/objects/document/ --acl=public-read --content-encoding gzip"
             )
 
         else:
-            logger.info(f"Exported {len(documents)} documents to {output_file}")
+            logger.info(f"Exported {total} documents to {output_file}")
             logger.info(
                 "Upload with: aws s3 sync data/s3/document/ s3://globalise-data/objects/document/ --acl=public-read"
             )
@@ -6,16 +6,16 @@ Generates gzipped JSON files ready for upload to the object store:
 """
 
 import gzip
-import json
 import os
 import sys
 import time
 
-from sqlalchemy import create_engine, func
-from sqlalchemy.orm import Session, selectinload
+from sqlalchemy import create_engine, func, select
+from sqlalchemy.orm import Session
 
-from models import Base, Inventory, Document, Scan, Page, Series
-from export import inventory_to_manifest_jsonld
+from models import Inventory
+from export import inventory_to_manifest_jsonld_stream
+from queries import MANIFEST_INVENTORY_OPTIONS
 
 DATABASE_URL = os.environ.get("DATABASE_URL", "sqlite:///globalise_documents.db")
 OUTPUT_DIR = os.environ.get("MANIFEST_OUTPUT_DIR", "data/s3/objects/inventory")
@@ -31,19 +31,22 @@ def export_all_manifests():
     total = session.query(func.count(Inventory.id)).scalar()
     print(f"Exporting manifests for {total} inventories to {OUTPUT_DIR}/")
 
-    inventories = session.query(Inventory).all()
+    inventory_ids = session.scalars(select(Inventory.id)).all()
 
     t0 = time.time()
-    for i, inventory in enumerate(inventories, 1):
+    for i, inventory_id in enumerate(inventory_ids, 1):
+        # One inventory at a time, with everything its manifest reads
+        inventory = session.get(
+            Inventory, inventory_id, options=MANIFEST_INVENTORY_OPTIONS
+        )
         inv_num = inventory.inventory_number
         manifest_uri = f"{BASE_URI}/inventory:{inv_num}.manifest"
-        manifest = inventory_to_manifest_jsonld(inventory, manifest_uri)
 
+        # Write the compact JSON chunks as they are produced, the same bytes
+        # the app serves, without building the manifest as a dict first
         out_path = os.path.join(OUTPUT_DIR, f"{inv_num}.manifest.json")
-        json_bytes = json.dumps(manifest, ensure_ascii=False, indent=2).encode("utf-8")
-
         with gzip.open(out_path, "wb") as f:
-            f.write(json_bytes)
+            f.writelines(inventory_to_manifest_jsonld_stream(inventory, manifest_uri))
 
         if i % 50 == 0 or i == total:
             elapsed = time.time() - t0
@@ -5,8 +5,11 @@ Entities: Series, Inventory, Document, Scan, Page, DocumentType, Settlement
 and the junction / helper tables that connect them.
 """
 
+import os
+import time
 import uuid
 import enum
+from functools import cached_property, lru_cache
 from typing import Optional, List
 from datetime import date as Date
 
@@ -17,11 +20,68 @@ from sqlalchemy import (
     Text,
     Date as DateType,
     ForeignKey,
+    Index,
     Enum as SQLEnum,
     Table,
     Column,
+    DDL,
+    event,
+    inspect,
 )
-from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column, relationship
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.ext.associationproxy import association_proxy
+from sqlalchemy.ext.hybrid import hybrid_property
+from sqlalchemy.orm.base import NO_VALUE
+from sqlalchemy.orm import (
+    DeclarativeBase,
+    Mapped,
+    mapped_column,
+    relationship,
+)
+
+# Primary and foreign keys hold UUID strings. Stored as 36-character text on
+# SQLite (unchanged schema), as a native 16-byte UUID on PostgreSQL.
+UUIDString = String(36).with_variant(postgresql.UUID(as_uuid=False), "postgresql")
+
+
+def short_title(title: Optional[str], limit: int = 50) -> Optional[str]:
+    """Title cut to `limit` characters (marked with "...") for reprs.
+
+    Computed on demand: a @validates hook would only run on assignment, not
+    for rows loaded from the database, which is where reprs are logged.
+    """
+    if title is None or len(title) <= limit:
+        return title
+    return title[:limit] + "..."
+
+
+def new_uuid() -> str:
+    """Return a new time-ordered (version 7) UUID string.
+
+    The leading 48 bits are the Unix time in milliseconds, so ids created
+    one after another sort together and primary-key inserts append to the
+    end of the index instead of landing on random pages like uuid4 ids.
+    """
+    value = (time.time_ns() // 1_000_000) << 80 | int.from_bytes(os.urandom(10))
+    # Set the version (7) and RFC 4122 variant bits
+    value = value & ~(0xF << 76) | 0x7 << 76
+    value = value & ~(0x3 << 62) | 0x2 << 62
+    return str(uuid.UUID(int=value))
+
+
+def value_enum(enum_class, constraint_name: str) -> SQLEnum:
+    """Column type storing an enum's values as VARCHAR with a CHECK constraint.
+
+    No native ENUM type is created on PostgreSQL, so adding a value later is
+    a constraint change rather than an ALTER TYPE.
+    """
+    return SQLEnum(
+        enum_class,
+        values_callable=lambda obj: [e.value for e in obj],
+        native_enum=False,
+        create_constraint=True,
+        name=constraint_name,
+    )
 
 
 class Base(DeclarativeBase):
@@ -32,20 +92,18 @@ class Base(DeclarativeBase):
 inventory_series = Table(
     "inventory_series",
     Base.metadata,
-    Column("inventory_id", String(36), ForeignKey("inventory.id"), primary_key=True),
-    Column("series_id", String(36), ForeignKey("series.id"), primary_key=True),
+    Column("inventory_id", UUIDString, ForeignKey("inventory.id"), primary_key=True),
+    Column("series_id", UUIDString, ForeignKey("series.id"), primary_key=True),
 )
 
 
 class Series(Base):
     __tablename__ = "series"
 
-    id: Mapped[str] = mapped_column(
-        String(36), primary_key=True, default=lambda: str(uuid.uuid4())
-    )
+    id: Mapped[str] = mapped_column(UUIDString, primary_key=True, default=new_uuid)
     title: Mapped[str] = mapped_column(Text)
     part_of_id: Mapped[Optional[str]] = mapped_column(
-        String(36), ForeignKey("series.id"), index=True
+        UUIDString, ForeignKey("series.id"), index=True
     )
 
     # Relationships
@@ -63,7 +121,7 @@ class Series(Base):
     )
 
     def __repr__(self):
-        return f"<Series(title='{self.title[:50]}...')>"
+        return f"<Series(title='{short_title(self.title)}')>"
 
     def __str__(self):
         return self.title
@@ -72,9 +130,7 @@ class Series(Base):
 class Inventory(Base):
     __tablename__ = "inventory"
 
-    id: Mapped[str] = mapped_column(
-        String(36), primary_key=True, default=lambda: str(uuid.uuid4())
-    )
+    id: Mapped[str] = mapped_column(UUIDString, primary_key=True, default=new_uuid)
     inventory_number: Mapped[str] = mapped_column(String(10), index=True, unique=True)
     na_identifier: Mapped[Optional[str]] = mapped_column(String(36))
     handle: Mapped[Optional[str]] = mapped_column(String(255))
@@ -83,7 +139,10 @@ class Inventory(Base):
 
     # Relationships
     titles: Mapped[List["InventoryTitle"]] = relationship(
-        "InventoryTitle", back_populates="inventory", cascade="all, delete-orphan"
+        "InventoryTitle",
+        back_populates="inventory",
+        cascade="all, delete-orphan",
+        passive_deletes=True,
     )
     documents: Mapped[List["Document"]] = relationship(
         "Document", back_populates="inventory"
@@ -104,19 +163,17 @@ class Inventory(Base):
 class InventoryTitle(Base):
     __tablename__ = "inventory_title"
 
-    id: Mapped[str] = mapped_column(
-        String(36), primary_key=True, default=lambda: str(uuid.uuid4())
-    )
+    id: Mapped[str] = mapped_column(UUIDString, primary_key=True, default=new_uuid)
     title: Mapped[str] = mapped_column(Text)
     inventory_id: Mapped[str] = mapped_column(
-        String(36), ForeignKey("inventory.id"), index=True
+        UUIDString, ForeignKey("inventory.id", ondelete="CASCADE"), index=True
     )
 
     # Relationships
     inventory: Mapped["Inventory"] = relationship("Inventory", back_populates="titles")
 
     def __repr__(self):
-        return f"<InventoryTitle(title='{self.title[:50]}...')>"
+        return f"<InventoryTitle(title='{short_title(self.title)}')>"
 
     def __str__(self):
         return self.title
@@ -125,9 +182,7 @@ class InventoryTitle(Base):
 class DocumentIdentificationMethod(Base):
     __tablename__ = "document_identification_method"
 
-    id: Mapped[str] = mapped_column(
-        String(36), primary_key=True, default=lambda: str(uuid.uuid4())
-    )
+    id: Mapped[str] = mapped_column(UUIDString, primary_key=True, default=new_uuid)
     name: Mapped[str] = mapped_column(String(255))
     description: Mapped[Optional[str]] = mapped_column(Text)
     date: Mapped[Optional[Date]] = mapped_column(DateType)
@@ -156,9 +211,7 @@ class Settlement(Base):
 
     __tablename__ = "settlement"
 
-    id: Mapped[str] = mapped_column(
-        String(36), primary_key=True, default=lambda: str(uuid.uuid4())
-    )
+    id: Mapped[str] = mapped_column(UUIDString, primary_key=True, default=new_uuid)
     glob_id: Mapped[str] = mapped_column(
         String(64),
         unique=True,
@@ -168,7 +221,10 @@ class Settlement(Base):
 
     # Relationships
     labels: Mapped[List["SettlementLabel"]] = relationship(
-        "SettlementLabel", back_populates="settlement", cascade="all, delete-orphan"
+        "SettlementLabel",
+        back_populates="settlement",
+        cascade="all, delete-orphan",
+        passive_deletes=True,
     )
     documents: Mapped[List["Document"]] = relationship(
         "Document", back_populates="location"
@@ -195,14 +251,12 @@ class SettlementLabel(Base):
 
     __tablename__ = "settlement_label"
 
-    id: Mapped[str] = mapped_column(
-        String(36), primary_key=True, default=lambda: str(uuid.uuid4())
-    )
+    id: Mapped[str] = mapped_column(UUIDString, primary_key=True, default=new_uuid)
     label: Mapped[str] = mapped_column(
         String(255), index=True, comment="Settlement name or spelling variant"
     )
     settlement_id: Mapped[str] = mapped_column(
-        String(36), ForeignKey("settlement.id"), index=True
+        UUIDString, ForeignKey("settlement.id", ondelete="CASCADE"), index=True
     )
 
     # Relationships
@@ -220,11 +274,9 @@ class SettlementLabel(Base):
 class Document(Base):
     __tablename__ = "document"
 
-    id: Mapped[str] = mapped_column(
-        String(36), primary_key=True, default=lambda: str(uuid.uuid4())
-    )
+    id: Mapped[str] = mapped_column(UUIDString, primary_key=True, default=new_uuid)
     inventory_id: Mapped[str] = mapped_column(
-        String(36), ForeignKey("inventory.id"), index=True
+        UUIDString, ForeignKey("inventory.id"), index=True
     )
     title: Mapped[Optional[str]] = mapped_column(Text)
     date_earliest_begin: Mapped[Optional[Date]] = mapped_column(DateType, index=True)
@@ -233,10 +285,10 @@ class Document(Base):
     date_latest_end: Mapped[Optional[Date]] = mapped_column(DateType)
     date_text: Mapped[Optional[str]] = mapped_column(Text)
     part_of_id: Mapped[Optional[str]] = mapped_column(
-        String(36), ForeignKey("document.id"), index=True
+        UUIDString, ForeignKey("document.id"), index=True
     )
     location_id: Mapped[Optional[str]] = mapped_column(
-        String(36),
+        UUIDString,
         ForeignKey("settlement.id"),
         index=True,
         comment="FK to Settlement; populated from location_index.csv via OBP import",
@@ -250,8 +302,14 @@ class Document(Base):
         Integer,
         comment="Last folio number of the document as recorded in the OBP index",
     )
+    page_count: Mapped[int] = mapped_column(
+        Integer,
+        default=0,
+        server_default="0",
+        comment="Number of page2document links; kept up to date by database triggers",
+    )
     method_id: Mapped[str] = mapped_column(
-        String(36), ForeignKey("document_identification_method.id"), index=True
+        UUIDString, ForeignKey("document_identification_method.id"), index=True
     )
 
     # Relationships
@@ -274,42 +332,79 @@ class Document(Base):
         "Settlement", back_populates="documents"
     )
     document_types: Mapped[List["Document2Type"]] = relationship(
-        "Document2Type", back_populates="document", cascade="all, delete-orphan"
+        "Document2Type",
+        back_populates="document",
+        cascade="all, delete-orphan",
+        passive_deletes=True,
     )
     document_types_linked: Mapped[List["Document2DocumentType"]] = relationship(
-        "Document2DocumentType", back_populates="document", cascade="all, delete-orphan"
+        "Document2DocumentType",
+        back_populates="document",
+        cascade="all, delete-orphan",
+        passive_deletes=True,
     )  # Links to DocumentType via Document2DocumentType
     external_ids: Mapped[List["Document2ExternalID"]] = relationship(
-        "Document2ExternalID", back_populates="document", cascade="all, delete-orphan"
-    )
+        "Document2ExternalID",
+        back_populates="document",
+        cascade="all, delete-orphan",
+        passive_deletes=True,
+    )
+    # The ExternalID rows themselves, skipping the link objects; load with
+    # queries.DOCUMENT_EXTERNAL_IDS to fetch links and targets in one query
+    externals = association_proxy(
+        "external_ids",
+        "external",
+        creator=lambda external: Document2ExternalID(external=external),
+    )
+    # Read whenever a Document is shown, counted or exported: loaded with one
+    # IN query per batch of documents; queries that only list documents opt
+    # out with lazyload(Document.pages)
     pages: Mapped[List["Page2Document"]] = relationship(
-        "Page2Document", back_populates="document", cascade="all, delete-orphan"
+        "Page2Document",
+        back_populates="document",
+        cascade="all, delete-orphan",
+        passive_deletes=True,
+        lazy="selectin",
+        order_by="Page2Document.index",
     )
 
-    @property
+    @hybrid_property
     def number_of_pages(self):
         """Get the number of pages in the document."""
-        return len(self.pages)
+        # The stored count, unless the page links are loaded already (they
+        # include links added in this session that the triggers have not seen).
+        # Never loads anything, so it also works on detached documents; a
+        # document not yet inserted only has the links added to it.
+        state = inspect(self)
+        if state.key is None or "pages" not in state.unloaded:
+            return len(self.pages)
+        return self.page_count
+
+    @number_of_pages.inplace.expression
+    @classmethod
+    def _number_of_pages_expression(cls):
+        return cls.page_count
 
     def __repr__(self):
-        return f"<Document(title='{self.title}', inventory='{self.inventory_id}')>"
+        return f"<Document(title='{short_title(self.title)}', inventory='{self.inventory_id}')>"
 
     def __str__(self):
-        return (
-            f"{self.title} ({self.inventory.inventory_number})"
-            if self.title
-            else f"Document {self.id}"
-        )
+        if not self.title:
+            return f"Document {self.id}"
+        # Use the inventory only if it is loaded: printing a document must not
+        # lazy-load it (or trip a raiseload)
+        inventory = inspect(self).attrs.inventory.loaded_value
+        if inventory is NO_VALUE or inventory is None:
+            return f"{self.title} ({self.inventory_id})"
+        return f"{self.title} ({inventory.inventory_number})"
 
 
 class Document2Type(Base):
     __tablename__ = "document2type"
 
-    id: Mapped[str] = mapped_column(
-        String(36), primary_key=True, default=lambda: str(uuid.uuid4())
-    )
+    id: Mapped[str] = mapped_column(UUIDString, primary_key=True, default=new_uuid)
     document_id: Mapped[str] = mapped_column(
-        String(36), ForeignKey("document.id"), index=True
+        UUIDString, ForeignKey("document.id", ondelete="CASCADE"), index=True
     )
     document_type: Mapped[str] = mapped_column(String(255))
 
@@ -325,9 +420,7 @@ class Document2Type(Base):
 class ExternalID(Base):
     __tablename__ = "external_id"
 
-    id: Mapped[str] = mapped_column(
-        String(36), primary_key=True, default=lambda: str(uuid.uuid4())
-    )
+    id: Mapped[str] = mapped_column(UUIDString, primary_key=True, default=new_uuid)
     URL: Mapped[Optional[str]] = mapped_column(String(255))
     identifier: Mapped[Optional[str]] = mapped_column(String(255))
     context: Mapped[Optional[str]] = mapped_column(String(255))
@@ -350,14 +443,12 @@ class ExternalID(Base):
 class Document2ExternalID(Base):
     __tablename__ = "document2external_id"
 
-    id: Mapped[str] = mapped_column(
-        String(36), primary_key=True, default=lambda: str(uuid.uuid4())
-    )
+    id: Mapped[str] = mapped_column(UUIDString, primary_key=True, default=new_uuid)
     document_id: Mapped[str] = mapped_column(
-        String(36), ForeignKey("document.id"), index=True
+        UUIDString, ForeignKey("document.id", ondelete="CASCADE"), index=True
     )
     external_id: Mapped[str] = mapped_column(
-        String(36), ForeignKey("external_id.id"), index=True
+        UUIDString, ForeignKey("external_id.id"), index=True
     )
 
     # Relationships
@@ -376,7 +467,7 @@ class DocumentType(Base):
     __tablename__ = "document_type"
 
     id: Mapped[str] = mapped_column(
-        String(36), primary_key=True, comment="UUID extracted from the concept URI"
+        UUIDString, primary_key=True, comment="UUID extracted from the concept URI"
     )
     scheme: Mapped[str] = mapped_column(
         String(16), index=True, comment="GLOBALISE or TANAP"
@@ -414,14 +505,12 @@ class Document2DocumentType(Base):
 
     __tablename__ = "document2documenttype"
 
-    id: Mapped[str] = mapped_column(
-        String(36), primary_key=True, default=lambda: str(uuid.uuid4())
-    )
+    id: Mapped[str] = mapped_column(UUIDString, primary_key=True, default=new_uuid)
     document_id: Mapped[str] = mapped_column(
-        String(36), ForeignKey("document.id"), index=True
+        UUIDString, ForeignKey("document.id", ondelete="CASCADE"), index=True
     )
     document_type_id: Mapped[str] = mapped_column(
-        String(36), ForeignKey("document_type.id"), index=True
+        UUIDString, ForeignKey("document_type.id"), index=True
     )
 
     # Relationships
@@ -446,26 +535,32 @@ class PageType(str, enum.Enum):
     OTHER = "Other"
 
 
+@lru_cache(maxsize=16)
+def _iiif_image_suffix(size: str) -> str:
+    """IIIF Image API path for a size; only a handful of sizes are used."""
+    return f"full/{size}/0/default.jpg"
+
+
 class Scan(Base):
     __tablename__ = "scan"
-
-    id: Mapped[str] = mapped_column(
-        String(36), primary_key=True, default=lambda: str(uuid.uuid4())
+    # Scans of an inventory in filename order (also serves inventory_id lookups)
+    __table_args__ = (
+        Index("ix_scan_inventory_id_filename", "inventory_id", "filename"),
     )
+
+    id: Mapped[str] = mapped_column(UUIDString, primary_key=True, default=new_uuid)
     filename: Mapped[str] = mapped_column(String(255), index=True)
 
     na_identifier: Mapped[Optional[str]] = mapped_column(String(36))
     iiif_image_info: Mapped[Optional[str]] = mapped_column(String(255))
 
-    inventory_id: Mapped[str] = mapped_column(
-        String(36), ForeignKey("inventory.id"), index=True
-    )
+    inventory_id: Mapped[str] = mapped_column(UUIDString, ForeignKey("inventory.id"))
 
     height: Mapped[int] = mapped_column(Integer)
     width: Mapped[int] = mapped_column(Integer)
 
     scan_type: Mapped[Optional[PageType]] = mapped_column(
-        SQLEnum(PageType, values_callable=lambda obj: [e.value for e in obj])
+        value_enum(PageType, "ck_scan_scan_type")
     )
 
     has_transcriptions: Mapped[bool] = mapped_column(Boolean, default=False)
@@ -487,19 +582,29 @@ class Scan(Base):
     inventory: Mapped["Inventory"] = relationship("Inventory", back_populates="scans")
     pages: Mapped[List["Page"]] = relationship("Page", back_populates="scan")
 
-    def get_thumbnail_url(self):
-        """Get IIIF thumbnail URL."""
+    @cached_property
+    def iiif_image_prefix(self):
+        """IIIF image service base URL (iiif_image_info without "info.json")."""
+        # Computed once per instance: gallery pages build many URLs per scan
         url = self.iiif_image_info
-        if url is None:
+        if url is None or not url.endswith("info.json") or url.count("info.json") > 1:
             return None
-        return url.replace("info.json", "full/200,/0/default.jpg")
+        return url[: -len("info.json")]
+
+    def get_thumbnail_url(self):
+        """Get IIIF thumbnail URL."""
+        return self.get_image_url("200,")
 
     def get_image_url(self, size="500,"):
         """Get IIIF image URL with specific size."""
+        suffix = _iiif_image_suffix(size)
+        prefix = self.iiif_image_prefix
+        if prefix is not None:
+            return prefix + suffix
         url = self.iiif_image_info
         if url is None:
             return None
-        return url.replace("info.json", f"full/{size}/0/default.jpg")
+        return url.replace("info.json", suffix)
 
     def __repr__(self):
         return f"<Scan(filename='{self.filename}')>"
@@ -538,20 +643,20 @@ class LinkConfidence(str, enum.Enum):
 
 class Page(Base):
     __tablename__ = "page"
+    # Pages of an inventory by scan (also serves inventory_id lookups)
+    __table_args__ = (Index("ix_page_inventory_id_scan_id", "inventory_id", "scan_id"),)
 
-    id: Mapped[str] = mapped_column(
-        String(36), primary_key=True, default=lambda: str(uuid.uuid4())
-    )
+    id: Mapped[str] = mapped_column(UUIDString, primary_key=True, default=new_uuid)
     page_or_folio_number: Mapped[Optional[str]] = mapped_column(String(255))
     recto_verso: Mapped[Optional[RectoVerso]] = mapped_column(
-        SQLEnum(RectoVerso, values_callable=lambda obj: [e.value for e in obj])
+        value_enum(RectoVerso, "ck_page_recto_verso")
     )
     header: Mapped[Optional[str]] = mapped_column(Text)
     inventory_id: Mapped[Optional[str]] = mapped_column(
-        String(36), ForeignKey("inventory.id"), index=True
+        UUIDString, ForeignKey("inventory.id")
     )
     scan_id: Mapped[Optional[str]] = mapped_column(
-        String(36), ForeignKey("scan.id"), index=True
+        UUIDString, ForeignKey("scan.id"), index=True
     )
     detected_languages: Mapped[Optional[str]] = mapped_column(Text)
     rotation: Mapped[int] = mapped_column(Integer, default=0)
@@ -568,29 +673,43 @@ class Page(Base):
     )
     scan: Mapped[Optional["Scan"]] = relationship("Scan", back_populates="pages")
     documents: Mapped[List["Page2Document"]] = relationship(
-        "Page2Document", back_populates="page", cascade="all, delete-orphan"
+        "Page2Document",
+        back_populates="page",
+        cascade="all, delete-orphan",
+        passive_deletes=True,
     )
 
     def __repr__(self):
         return f"<Page(scan='{self.scan_id}', recto_verso='{self.recto_verso}')>"
 
     def __str__(self):
-        if self.scan and self.recto_verso:
-            return f"Page for scan {self.scan.filename} ({self.recto_verso.value})"
-        elif self.scan:
-            return f"Page for scan {self.scan.filename}"
+        # Use the scan filename only if the scan is loaded; otherwise name the
+        # scan by id rather than lazy-loading it
+        scan = inspect(self).attrs.scan.loaded_value
+        if scan is NO_VALUE:
+            scan_label = self.scan_id
+        else:
+            scan_label = scan.filename if scan else None
+        if scan_label and self.recto_verso:
+            return f"Page for scan {scan_label} ({self.recto_verso.value})"
+        elif scan_label:
+            return f"Page for scan {scan_label}"
         return f"Page {self.id}"
 
 
 class Page2Document(Base):
     __tablename__ = "page2document"
+    # A document's page links in page order (also serves document_id lookups)
+    __table_args__ = (
+        Index("ix_page2document_document_id_index", "document_id", "index"),
+    )
 
-    id: Mapped[str] = mapped_column(
-        String(36), primary_key=True, default=lambda: str(uuid.uuid4())
+    id: Mapped[str] = mapped_column(UUIDString, primary_key=True, default=new_uuid)
+    page_id: Mapped[str] = mapped_column(
+        UUIDString, ForeignKey("page.id", ondelete="CASCADE"), index=True
     )
-    page_id: Mapped[str] = mapped_column(String(36), ForeignKey("page.id"), index=True)
     document_id: Mapped[str] = mapped_column(
-        String(36), ForeignKey("document.id"), index=True
+        UUIDString, ForeignKey("document.id", ondelete="CASCADE")
     )
     index: Mapped[int] = mapped_column(Integer)
     source: Mapped[str] = mapped_column(
@@ -600,14 +719,17 @@ class Page2Document(Base):
         comment="Which script/process created this link (e.g. BASELINE, FOLIO_RANGE, INTERPOLATED)",
     )
     confidence: Mapped[LinkConfidence] = mapped_column(
-        SQLEnum(LinkConfidence, values_callable=lambda obj: [e.value for e in obj]),
+        value_enum(LinkConfidence, "ck_page2document_confidence"),
         default=LinkConfidence.DEFINITIVE,
         server_default=LinkConfidence.DEFINITIVE.value,
         comment="Confidence tier for this page–document link; see LinkConfidence enum",
     )
 
-    # Relationships
-    page: Mapped["Page"] = relationship("Page", back_populates="documents")
+    # Relationships (the page is joined into the link query; the document is
+    # usually the owner the link was loaded from, already in the session)
+    page: Mapped["Page"] = relationship(
+        "Page", back_populates="documents", lazy="joined"
+    )
     document: Mapped["Document"] = relationship("Document", back_populates="pages")
 
     def __repr__(self):
@@ -615,3 +737,69 @@ class Page2Document(Base):
             f"<Page2Document(page_id='{self.page_id}', document_id='{self.document_id}', "
             f"index={self.index}, source='{self.source}', confidence='{self.confidence.value}')>"
         )
+
+
+# Keep document.page_count in step with page2document for every write path,
+# including the Core and raw-SQL inserts of the import scripts.
+# 19_add_page_count.py installs the same triggers on an existing database.
+PAGE_COUNT_TRIGGERS = {
+    "sqlite": [
+        """
+        CREATE TRIGGER IF NOT EXISTS page2document_page_count_insert
+        AFTER INSERT ON page2document
+        BEGIN
+            UPDATE document SET page_count = page_count + 1
+            WHERE id = NEW.document_id;
+        END
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS page2document_page_count_delete
+        AFTER DELETE ON page2document
+        BEGIN
+            UPDATE document SET page_count = page_count - 1
+            WHERE id = OLD.document_id;
+        END
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS page2document_page_count_update
+        AFTER UPDATE OF document_id ON page2document
+        WHEN OLD.document_id IS NOT NEW.document_id
+        BEGIN
+            UPDATE document SET page_count = page_count - 1
+            WHERE id = OLD.document_id;
+            UPDATE document SET page_count = page_count + 1
+            WHERE id = NEW.document_id;
+        END
+        """,
+    ],
+    "postgresql": [
+        """
+        CREATE OR REPLACE FUNCTION page2document_page_count() RETURNS trigger AS $$
+        BEGIN
+            IF TG_OP IN ('DELETE', 'UPDATE') THEN
+                UPDATE document SET page_count = page_count - 1
+                WHERE id = OLD.document_id;
+            END IF;
+            IF TG_OP IN ('INSERT', 'UPDATE') THEN
+                UPDATE document SET page_count = page_count + 1
+                WHERE id = NEW.document_id;
+            END IF;
+            RETURN NULL;
+        END
+        $$ LANGUAGE plpgsql
+        """,
+        """
+        CREATE OR REPLACE TRIGGER page2document_page_count
+        AFTER INSERT OR DELETE OR UPDATE OF document_id ON page2document
+        FOR EACH ROW EXECUTE FUNCTION page2document_page_count()
+        """,
+    ],
+}
+
+for _dialect, _statements in PAGE_COUNT_TRIGGERS.items():
+    for _statement in _statements:
+        event.listen(
+            Page2Document.__table__,
+            "after_create",
+            DDL(_statement).execute_if(dialect=_dialect),
+        )
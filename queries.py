@@ -0,0 +1,162 @@
+"""
+Query helpers for the read-heavy routes and exports.
+
+Each ORM loader eagerly loads every relationship its serializer walks and
+ends with raiseload("*"), so an unplanned relationship access raises instead
+of silently issuing one SELECT per object. The Core fetchers return plain
+row mappings for views that only need a few columns from many rows. The
+iterators walk whole tables in batches, keeping the session's identity map
+bounded.
+"""
+
+from typing import Iterator, Optional, Sequence, Tuple
+
+from sqlalchemy import RowMapping, Select, bindparam, select
+from sqlalchemy.orm import Session, joinedload, raiseload, selectinload
+
+from models import (
+    Document,
+    Document2DocumentType,
+    Document2ExternalID,
+    Inventory,
+    Page,
+    Page2Document,
+    Scan,
+    Settlement,
+)
+
+# Point lookups for the detail routes, built once and executed with
+# parameters; every request hits the same compiled-statement cache entry
+SCAN_BY_FILENAME = select(Scan).where(Scan.filename == bindparam("filename"))
+PAGE_BY_ID = select(Page).where(Page.id == bindparam("id"))
+
+# Document.external_ids with their ExternalID rows: one IN query for the
+# links, joined onto external_id (Document.externals reads the same data)
+DOCUMENT_EXTERNAL_IDS = selectinload(Document.external_ids).joinedload(
+    Document2ExternalID.external
+)
+
+# Everything document_physical_to_jsonld reads
+DOCUMENT_API_OPTIONS = (
+    selectinload(Document.document_types_linked).joinedload(
+        Document2DocumentType.document_type
+    ),
+    selectinload(Document.pages).joinedload(Page2Document.page).joinedload(Page.scan),
+    DOCUMENT_EXTERNAL_IDS,
+    joinedload(Document.location).selectinload(Settlement.labels),
+    raiseload("*"),
+)
+
+# Everything page_to_jsonld reads
+PAGE_API_OPTIONS = (
+    joinedload(Page.scan),
+    raiseload("*"),
+)
+
+# Everything the IIIF manifest reads from the inventory and its documents;
+# range canvases come from fetch_inventory_tree, not from the page links
+MANIFEST_INVENTORY_OPTIONS = (
+    selectinload(Inventory.titles),
+    selectinload(Inventory.member_of_series),
+    selectinload(Inventory.documents).options(
+        selectinload(Document.document_types_linked).joinedload(
+            Document2DocumentType.document_type
+        ),
+        DOCUMENT_EXTERNAL_IDS,
+        selectinload(Document.sub_documents),
+        joinedload(Document.location).selectinload(Settlement.labels),
+        raiseload("*"),
+    ),
+    raiseload("*"),
+)
+
+
+def load_document_for_api(session: Session, document_id: str) -> Optional[Document]:
+    """Load a Document with everything the JSON-LD serializer needs."""
+    return (
+        session.scalars(
+            select(Document)
+            .where(Document.id == document_id)
+            .options(*DOCUMENT_API_OPTIONS)
+        )
+        .unique()
+        .one_or_none()
+    )
+
+
+def load_page_for_api(session: Session, page_id: str) -> Optional[Page]:
+    """Load a Page with everything the JSON-LD serializer needs."""
+    return (
+        session.scalars(
+            select(Page).where(Page.id == page_id).options(*PAGE_API_OPTIONS)
+        )
+        .unique()
+        .one_or_none()
+    )
+
+
+def fetch_inventory_tree(session: Session, inventory_id: str) -> Sequence[RowMapping]:
+    """Fetch the document → page → scan links of an inventory in one query.
+
+    Returns row mappings with document_id, title, index, page_id and
+    filename (None for a page without a scan), ordered by document and
+    page index. No ORM objects are built.
+    """
+    return (
+        session.execute(
+            select(
+                Document.id.label("document_id"),
+                Document.title,
+                Page2Document.index,
+                Page.id.label("page_id"),
+                Scan.filename,
+            )
+            .join(Page2Document, Page2Document.document_id == Document.id)
+            .join(Page, Page.id == Page2Document.page_id)
+            .outerjoin(Scan, Scan.id == Page.scan_id)
+            .where(Document.inventory_id == inventory_id)
+            .order_by(Document.id, Page2Document.index)
+        )
+        .mappings()
+        .all()
+    )
+
+
+def fetch_document_page_ids(
+    session: Session, inventory_id: str
+) -> Sequence[Tuple[str, str]]:
+    """(document_id, page_id) for every page link of an inventory's documents.
+
+    Returned as plain tuples, for bulk reads that would otherwise load one
+    Page2Document instance per link.
+    """
+    return (
+        session.execute(
+            select(Page2Document.document_id, Page2Document.page_id)
+            .join(Document, Document.id == Page2Document.document_id)
+            .where(Document.inventory_id == inventory_id)
+        )
+        .tuples()
+        .all()
+    )
+
+
+def iter_in_batches(session: Session, stmt: Select, batch_size: int = 1000) -> Iterator:
+    """Yield the ORM objects of `stmt`, building `batch_size` at a time.
+
+    Rows are streamed with yield_per (a server-side cursor where the driver
+    supports one) instead of being fetched and built all at once. The
+    session's identity map only holds weak references to unmodified objects,
+    so for read-only traversals memory stays proportional to one batch as
+    long as the caller does not keep the objects it has finished with.
+    """
+    return iter(
+        session.scalars(
+            stmt.execution_options(yield_per=batch_size, stream_results=True)
+        )
+    )
+
+
+def iter_all_pages(session: Session, batch_size: int = 1000) -> Iterator[Page]:
+    """Yield every Page, `batch_size` at a time."""
+    return iter_in_batches(session, select(Page).order_by(Page.id), batch_size)